@@ -0,0 +1,68 @@
+"""Gunicorn configuration for the production API server.
+
+Usage:
+    gunicorn -c gunicorn.conf.py src.app:app
+"""
+import os
+import multiprocessing
+
+# Async workers: greenlets yield while waiting on Typesense/OpenAI sockets
+# instead of blocking the whole worker. Set GUNICORN_WORKER_CLASS=gthread for
+# plain threads (no monkey-patching) or sync to opt out entirely.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+
+if worker_class == "gevent":
+    # Patch before preload_app imports typesense/openai (and their ssl/socket
+    # modules) in the master, so workers inherit cooperative sockets
+    from gevent import monkey
+    monkey.patch_all()
+
+# Bind to the same port the Flask dev server uses
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', '5001')}"
+
+# Search requests spend most of their time waiting on Typesense + OpenAI,
+# so use the (2 x CPU) + 1 rule and allow an override for small instances
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+
+# Concurrent requests per gevent worker
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+# Request threads per gthread worker (ignored by gevent/sync workers)
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+# Import the app's modules (Flask, pydantic, numpy, the typesense/openai
+# packages) once in the master and share them copy-on-write with the forked
+# workers. Only imports are shared: clients are built per worker in post_fork
+preload_app = True
+
+# RAG search makes two LLM calls, allow for slow responses
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+# Log to stdout/stderr so Render picks it up
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    """Validate configuration in the master before any worker is forked.
+
+    The search engine is only built after fork, so without this a missing
+    API key would surface as every worker failing to boot.
+    """
+    from src.config import Config
+
+    try:
+        Config.validate()
+    except ValueError as e:
+        # gunicorn reports RuntimeError as "Error: ..." and exits with status 1
+        raise RuntimeError(str(e)) from e
+
+
+def post_fork(server, worker):
+    """Build the search engine in each worker right after fork.
+
+    Typesense/OpenAI clients hold connection pools, which must not be shared
+    across processes, so they are created per worker rather than in the master.
+    """
+    from src.app import get_search_engine
+    get_search_engine()
@@ -1,4 +1,6 @@
 """Flask API server for natural language search."""
+import os
+import re
 import sys
 from pathlib import Path
 
@@ -6,18 +8,53 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
+from flask_compress import Compress
 from src.config import Config
 from src.search_rag import RAGNaturalLanguageSearch
-from src.models import SearchQuery
-import traceback
+from src.models import SearchResponse
+from src.cache import SemanticCache
+from src.circuit_breaker import CircuitOpenError
+import time
+import hashlib
+import logging
+from typing import Any, Optional, Tuple, Union
+import functools
+import orjson
+import openai
+import requests
+import typesense
+
+# Log to stderr via the logging module (integrates with Gunicorn's --log-level)
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(process)d] [%(levelname)s] %(name)s: %(message)s"
+)
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (used by any remaining Flask JSON helpers)."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize to a JSON string, deferring unsupported types to Flask's default."""
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize JSON from a string or bytes."""
+        return orjson.loads(s)
 
-# Validate configuration
-Config.validate()
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Compress JSON responses (search payloads are tens of KB), preferring zstd
+app.config["COMPRESS_ALGORITHM"] = ["zstd", "br", "gzip"]
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+app.config["COMPRESS_MIN_SIZE"] = 1024
+Compress(app)
 
 # CORS Configuration
 # For production, update with your actual frontend URL
@@ -30,14 +67,300 @@ CORS(app, origins=[
     "https://mercedes-nl-search.vercel.app"
 ])
 
-# Initialize RAG search engine (improved category classification)
-search_engine = RAGNaturalLanguageSearch()
+
+# Upper bound on results per request (matches models.SearchQuery)
+MAX_RESULTS_LIMIT = 100
+
+# Category confidence threshold used when the request doesn't set one
+DEFAULT_CONFIDENCE_THRESHOLD = 0.75
+
+# typesense_query keys returned without debug (the frontend shows the extracted query/filters)
+PUBLIC_TYPESENSE_QUERY_KEYS = frozenset({
+    "original_query",
+    "approach",
+    "note",
+    "cache",
+    "max_results",
+    "detected_category",
+    "category_applied",
+    "nl_extracted_query",
+    "nl_extracted_filters",
+    "nl_extracted_sort",
+})
+
+# Fallback error classification by message, for exceptions not matched by type
+ERROR_KIND_PATTERN = re.compile(r"(?P<unavailable>unavailable|cannot connect)|(?P<auth>authentication)", re.IGNORECASE)
+
+# Browser/CDN cache lifetime for GET /api/search responses
+SEARCH_GET_MAX_AGE_SECONDS = 60
+
+# Response fields that vary per request and are left out of the ETag
+ETAG_EXCLUDED_FIELDS = {"query_time_ms": True, "typesense_query": {"original_query": True, "cache": True}}
+
+# Constant error bodies, serialized once at import. Responses are still built per
+# request because Flask/CORS add headers to the response object in place.
+MISSING_QUERY_BODY = b'{"error":"Missing \'query\' in request body"}'
+INVALID_JSON_BODY = b'{"error":"Request body must be valid JSON"}'
+MISSING_Q_PARAM_BODY = b'{"error":"Missing \'q\' query parameter"}'
+NOT_FOUND_BODY = b'{"error":"Not found","message":"The requested endpoint does not exist"}'
+INTERNAL_ERROR_BODY = b'{"error":"Internal server error","message":"An unexpected error occurred"}'
+
+
+def _json_bytes_response(body: bytes, status: int) -> Response:
+    """Wrap pre-serialized JSON bytes in a response."""
+    return Response(body, status=status, mimetype="application/json")
+
+
+def _json_response(obj: Any, status: int = 200) -> Response:
+    """Serialize an object straight to JSON bytes with orjson and wrap it in a response."""
+    return _json_bytes_response(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), status)
+
+
+@functools.lru_cache(maxsize=1)
+def get_search_engine() -> RAGNaturalLanguageSearch:
+    """
+    Get the RAG search engine, creating it on first use.
+
+    Under Gunicorn each worker builds its own engine (see post_fork in
+    gunicorn.conf.py), so HTTP connection pools are never shared across forks.
+    """
+    return RAGNaturalLanguageSearch()
+
+
+@functools.lru_cache(maxsize=1)
+def get_search_cache() -> SemanticCache:
+    """Get the response cache for repeated and near-duplicate queries (skips both LLM calls)."""
+    return SemanticCache(
+        embed_fn=get_search_engine().embed_query,
+        similarity_threshold=Config.SEARCH_CACHE_SIMILARITY,
+        max_entries=Config.SEARCH_CACHE_SIZE,
+        ttl_seconds=Config.SEARCH_CACHE_TTL_SECONDS
+    )
+
+
+def _cached_search(
+    query: str,
+    max_results: int,
+    debug: bool,
+    confidence_threshold: float
+) -> Tuple[SearchResponse, Optional[str]]:
+    """
+    Run a RAG search, serving exact or near-duplicate queries from the cache.
+
+    Debug requests always run the full pipeline so the LLM reasoning is printed.
+    Other responses are cached without debug-only metadata, together with
+    their ETag, so a cache hit needs no serialization to be revalidated.
+
+    Args:
+        query: Natural language search query
+        max_results: Maximum number of results to return
+        debug: Enable debug mode
+        confidence_threshold: Minimum confidence to apply category filter
+
+    Returns:
+        Tuple of (SearchResponse, ETag or None for debug responses). Cached
+        responses report the lookup time as query_time_ms.
+    """
+    start_time = time.time()
+    namespace = (max_results, confidence_threshold)
+
+    if not debug:
+        cached, cache_tier = get_search_cache().get(query, namespace)
+        if cached is not None:
+            response, etag = cached
+            return response.model_copy(update={
+                "query_time_ms": (time.time() - start_time) * 1000,
+                "typesense_query": {
+                    **response.typesense_query,
+                    "original_query": query,
+                    "cache": cache_tier,
+                },
+            }), etag
+
+    response = get_search_engine().search(
+        query=query,
+        max_results=max_results,
+        debug=debug,
+        confidence_threshold=confidence_threshold
+    )
+    if debug:
+        return response, None
+
+    # Debug-only pipeline metadata (LLM reasoning, retrieval settings) stays out of regular responses
+    response = response.model_copy(update={
+        "typesense_query": {
+            key: value
+            for key, value in response.typesense_query.items()
+            if key in PUBLIC_TYPESENSE_QUERY_KEYS
+        }
+    })
+    etag = _search_etag(response)
+
+    # Don't cache empty results, they may come from a degraded fallback search
+    if response.results:
+        get_search_cache().set(query, (response, etag), namespace)
+
+    return response, etag
+
+
+def _search_etag(response: SearchResponse) -> str:
+    """
+    Build the ETag for a search response from its content.
+
+    Computed once per search and cached with the response. Per-request fields
+    (query_time_ms, the query text and the cache tier that served it) are left
+    out, so the same results get the same tag from every worker, whether they
+    came from a fresh search or either cache tier.
+
+    Args:
+        response: Search response without debug-only metadata
+
+    Returns:
+        ETag value
+    """
+    content = response.model_dump_json(exclude=ETAG_EXCLUDED_FIELDS)
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _etag_matches(etag: str) -> bool:
+    """
+    Check the request's If-None-Match against an ETag.
+
+    Args:
+        etag: ETag of the current response
+
+    Returns:
+        True if the client already has this response (tags suffixed by the
+        compression layer, e.g. "<etag>:gzip", also match)
+    """
+    for tag in request.if_none_match.as_set(include_weak=True):
+        if tag == etag or tag.startswith(f"{etag}:"):
+            return True
+    return request.if_none_match.star_tag
+
+
+def _with_http_caching(response: Response, etag: str) -> Response:
+    """
+    Add ETag and Cache-Control headers to a GET search response.
+
+    Args:
+        response: Search response (or empty 304)
+        etag: ETag from _cached_search
+
+    Returns:
+        The same response
+    """
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = SEARCH_GET_MAX_AGE_SECONDS
+    return response
+
+
+def _validate_search_params(
+    query: Any,
+    max_results: Any,
+    debug: Any = False,
+    confidence_threshold: Any = DEFAULT_CONFIDENCE_THRESHOLD
+) -> Tuple[str, int, bool, float]:
+    """
+    Validate search request fields (same rules as models.SearchQuery, without Pydantic).
+
+    Args:
+        query: Search query from the request
+        max_results: Requested result count from the request
+        debug: Debug flag from the request (must be a real boolean)
+        confidence_threshold: Category confidence threshold from the request (0-1)
+
+    Returns:
+        Tuple of (query, max_results, debug, confidence_threshold)
+
+    Raises:
+        ValueError: If any field is invalid
+    """
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("'query' must be a non-empty string")
+
+    if isinstance(max_results, bool):
+        raise ValueError("'max_results' must be an integer")
+    try:
+        max_results = int(max_results)
+    except (TypeError, ValueError):
+        raise ValueError("'max_results' must be an integer")
+
+    if not 1 <= max_results <= MAX_RESULTS_LIMIT:
+        raise ValueError(f"'max_results' must be between 1 and {MAX_RESULTS_LIMIT}")
+
+    # A string like "false" would be truthy, enabling debug and bypassing the cache
+    if not isinstance(debug, bool):
+        raise ValueError("'debug' must be a boolean")
+
+    # The threshold is part of the cache key, so it must be a hashable float
+    if isinstance(confidence_threshold, bool):
+        raise ValueError("'confidence_threshold' must be a number")
+    try:
+        confidence_threshold = float(confidence_threshold)
+    except (TypeError, ValueError):
+        raise ValueError("'confidence_threshold' must be a number")
+
+    # (NaN fails both comparisons)
+    if not 0 <= confidence_threshold <= 1:
+        raise ValueError("'confidence_threshold' must be between 0 and 1")
+
+    return query, max_results, debug, confidence_threshold
+
+
+def _error_response(e: Exception) -> Response:
+    """
+    Map a search exception to an error response.
+
+    Known client exceptions are dispatched by type; anything else falls back to
+    matching the error message (an unavailable match wins over authentication).
+
+    Args:
+        e: Exception raised while searching
+
+    Returns:
+        JSON error response (503 or 500)
+    """
+    error_message = str(e)
+
+    if isinstance(e, (typesense.exceptions.RequestUnauthorized, openai.AuthenticationError)):
+        unavailable, auth_error = False, True
+    elif isinstance(e, (
+        CircuitOpenError,
+        ConnectionError,
+        requests.exceptions.ConnectionError,
+        requests.exceptions.Timeout,
+        typesense.exceptions.ServiceUnavailable,
+        openai.APIConnectionError,
+    )):
+        unavailable, auth_error = True, False
+    else:
+        kinds = {match.lastgroup for match in ERROR_KIND_PATTERN.finditer(error_message)}
+        unavailable = "unavailable" in kinds
+        auth_error = "auth" in kinds
+
+    if unavailable:
+        return _json_response({
+            "error": error_message,
+            "message": "Search service is currently unavailable"
+        }, 503)  # Service Unavailable
+    elif auth_error:
+        return _json_response({
+            "error": "Configuration error",
+            "message": "Search service configuration error"
+        }, 500)
+    else:
+        return _json_response({
+            "error": error_message,
+            "message": "An error occurred while processing your search"
+        }, 500)
 
 
 @app.route("/")
 def home():
     """Health check endpoint."""
-    return jsonify({
+    return _json_response({
         "status": "ok",
         "message": "Mercedes Scientific Natural Language Search API (RAG-powered)",
         "version": "2.0",
@@ -49,28 +372,42 @@ def home():
     })
 
 
+# Health probes arrive every few seconds; reuse the last Typesense check briefly
+HEALTH_CACHE_SECONDS = 5
+_health_cache = {"ts": 0.0, "error": None}
+
+
 @app.route("/health")
 def health():
     """Health check for monitoring."""
-    try:
-        # Try to retrieve collections to verify Typesense connection
-        collections = search_engine.typesense_client.collections.retrieve()
-        return jsonify({
+    now = time.time()
+
+    if now - _health_cache["ts"] >= HEALTH_CACHE_SECONDS:
+        try:
+            # Try to retrieve collections to verify Typesense connection
+            get_search_engine().typesense_client.collections.retrieve()
+            _health_cache["error"] = None
+        except Exception as e:
+            _health_cache["error"] = str(e)
+        _health_cache["ts"] = now
+
+    if _health_cache["error"] is None:
+        return _json_response({
             "status": "healthy",
             "services": {
                 "api": "ok",
                 "typesense": "ok"
             }
         })
-    except Exception as e:
-        return jsonify({
-            "status": "unhealthy",
-            "services": {
-                "api": "ok",
-                "typesense": "error"
-            },
-            "error": str(e)
-        }), 503
+
+    return _json_response({
+        "status": "unhealthy",
+        "services": {
+            "api": "ok",
+            "typesense": "error"
+        },
+        "error": _health_cache["error"]
+    }, 503)
 
 
 @app.route("/api/search", methods=["POST"])
@@ -98,56 +435,45 @@ def search():
     }
     """
     try:
-        # Parse request
-        data = request.get_json()
-
-        if not data or "query" not in data:
-            return jsonify({
-                "error": "Missing 'query' in request body"
-            }), 400
-
-        # Validate with Pydantic
-        search_query = SearchQuery(
-            query=data["query"],
-            max_results=data.get("max_results", 20)
-        )
-
-        # Optional parameters for RAG search
-        debug = data.get("debug", False)
-        confidence_threshold = data.get("confidence_threshold", 0.75)
+        # Parse request body directly (no cached copy of the raw body)
+        raw_body = request.get_data(cache=False)
+        if not raw_body:
+            return _json_bytes_response(MISSING_QUERY_BODY, 400)
+
+        try:
+            data = orjson.loads(raw_body)
+        except orjson.JSONDecodeError:
+            return _json_bytes_response(INVALID_JSON_BODY, 400)
+
+        if not isinstance(data, dict) or "query" not in data:
+            return _json_bytes_response(MISSING_QUERY_BODY, 400)
+
+        try:
+            query, max_results, debug, confidence_threshold = _validate_search_params(
+                data["query"],
+                data.get("max_results", 20),
+                # Optional parameters for RAG search
+                data.get("debug", False),
+                data.get("confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD)
+            )
+        except ValueError as e:
+            return _json_response({"error": str(e)}, 400)
 
         # Execute RAG search
-        response = search_engine.search(
-            query=search_query.query,
-            max_results=search_query.max_results,
+        response, _ = _cached_search(
+            query=query,
+            max_results=max_results,
             debug=debug,
             confidence_threshold=confidence_threshold
         )
 
-        # Return results
-        return jsonify(response.model_dump())
+        # Pydantic serializes straight to JSON, no intermediate dict
+        return Response(response.model_dump_json(), mimetype="application/json")
 
     except Exception as e:
-        traceback.print_exc()
-
-        # Distinguish between different error types
-        error_message = str(e)
-
-        if "unavailable" in error_message.lower() or "cannot connect" in error_message.lower():
-            return jsonify({
-                "error": error_message,
-                "message": "Search service is currently unavailable"
-            }), 503  # Service Unavailable
-        elif "authentication" in error_message.lower():
-            return jsonify({
-                "error": "Configuration error",
-                "message": "Search service configuration error"
-            }), 500
-        else:
-            return jsonify({
-                "error": error_message,
-                "message": "An error occurred while processing your search"
-            }), 500
+        app.logger.exception("Search failed: %s", e)
+
+        return _error_response(e)
 
 
 @app.route("/api/search", methods=["GET"])
@@ -165,99 +491,113 @@ def search_get():
     """
     try:
         query = request.args.get("q", "")
-        max_results = int(request.args.get("limit", 20))
-        debug = request.args.get("debug", "false").lower() == "true"
-        confidence_threshold = float(request.args.get("confidence_threshold", 0.75))
 
         if not query:
-            return jsonify({
-                "error": "Missing 'q' query parameter"
-            }), 400
-
-        # Execute RAG search
-        response = search_engine.search(
+            return _json_bytes_response(MISSING_Q_PARAM_BODY, 400)
+
+        try:
+            query, max_results, debug, confidence_threshold = _validate_search_params(
+                query,
+                request.args.get("limit", 20),
+                request.args.get("debug", "false").lower() == "true",
+                request.args.get("confidence_threshold", DEFAULT_CONFIDENCE_THRESHOLD)
+            )
+        except ValueError as e:
+            return _json_response({"error": str(e)}, 400)
+
+        # Execute RAG search (repeat requests are usually served by the cache)
+        response, etag = _cached_search(
             query=query,
             max_results=max_results,
             debug=debug,
             confidence_threshold=confidence_threshold
         )
-
-        return jsonify(response.model_dump())
+        if debug:
+            return Response(response.model_dump_json(), mimetype="application/json")
+
+        # GET is idempotent: let browsers and CDNs cache and revalidate it.
+        # The tag comes with the search result, so a 304 skips serialization
+        # and a 200 serializes the body once
+        if _etag_matches(etag):
+            return _with_http_caching(Response(status=304), etag)
+        return _with_http_caching(
+            Response(response.model_dump_json(), mimetype="application/json"),
+            etag
+        )
 
     except Exception as e:
-        traceback.print_exc()
-
-        # Distinguish between different error types
-        error_message = str(e)
-
-        if "unavailable" in error_message.lower() or "cannot connect" in error_message.lower():
-            return jsonify({
-                "error": error_message,
-                "message": "Search service is currently unavailable"
-            }), 503  # Service Unavailable
-        elif "authentication" in error_message.lower():
-            return jsonify({
-                "error": "Configuration error",
-                "message": "Search service configuration error"
-            }), 500
-        else:
-            return jsonify({
-                "error": error_message,
-                "message": "An error occurred while processing your search"
-            }), 500
+        app.logger.exception("Search failed: %s", e)
+
+        return _error_response(e)
 
 
 @app.errorhandler(404)
 def not_found(e):
     """Handle 404 errors."""
-    return jsonify({
-        "error": "Not found",
-        "message": "The requested endpoint does not exist"
-    }), 404
+    return _json_bytes_response(NOT_FOUND_BODY, 404)
 
 
 @app.errorhandler(500)
 def internal_error(e):
     """Handle 500 errors."""
-    return jsonify({
-        "error": "Internal server error",
-        "message": "An unexpected error occurred"
-    }), 500
-
+    return _json_bytes_response(INTERNAL_ERROR_BODY, 500)
+
+
+def _print_banner():
+    """Print startup info and example requests for the development server (one buffered write)."""
+    rule = "=" * 60
+    port = Config.FLASK_PORT
+    lines = [
+        rule,
+        "Mercedes Scientific Natural Language Search API v2.0",
+        "RAG-Powered Category Classification",
+        rule,
+        f"Environment: {Config.FLASK_ENV}",
+        f"Server: http://localhost:{port}",
+        f"Typesense: {Config.TYPESENSE_PROTOCOL}://{Config.TYPESENSE_HOST}:{Config.TYPESENSE_PORT}",
+        f"Collection: {Config.TYPESENSE_COLLECTION_NAME}",
+        f"OpenAI Model: {Config.OPENAI_MODEL}",
+        "Search Engine: RAG-based (improved)",
+        f"Default Confidence: {DEFAULT_CONFIDENCE_THRESHOLD}",
+        rule,
+        "\nEndpoints:",
+        "  GET  /              - API info",
+        "  GET  /health        - Health check",
+        "  POST /api/search    - Search products (JSON body)",
+        "  GET  /api/search    - Search products (query params)",
+        "\nExample requests:",
+        f"  curl -X POST http://localhost:{port}/api/search \\",
+        '    -H "Content-Type: application/json" \\',
+        '    -d \'{"query": "sterile gloves under $100"}\'',
+        f'\n  curl "http://localhost:{port}/api/search?q=pipettes%20in%20stock"',
+        "\n  # With debug mode:",
+        f'  curl "http://localhost:{port}/api/search?q=nitrile%20gloves&debug=true"',
+        rule,
+        "\nRAG Features:",
+        "  ✓ Smart category detection with LLM reasoning",
+        "  ✓ Conservative handling of ambiguous queries",
+        "  ✓ 84.6% accuracy on test dataset",
+        "  ✓ Transparent confidence scoring",
+        rule,
+        "",
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 if __name__ == "__main__":
-    print("=" * 60)
-    print("Mercedes Scientific Natural Language Search API v2.0")
-    print("RAG-Powered Category Classification")
-    print("=" * 60)
-    print(f"Environment: {Config.FLASK_ENV}")
-    print(f"Server: http://localhost:{Config.FLASK_PORT}")
-    print(f"Typesense: {Config.TYPESENSE_PROTOCOL}://{Config.TYPESENSE_HOST}:{Config.TYPESENSE_PORT}")
-    print(f"Collection: {Config.TYPESENSE_COLLECTION_NAME}")
-    print(f"OpenAI Model: {Config.OPENAI_MODEL}")
-    print(f"Search Engine: RAG-based (improved)")
-    print(f"Default Confidence: 0.75")
-    print("=" * 60)
-    print("\nEndpoints:")
-    print(f"  GET  /              - API info")
-    print(f"  GET  /health        - Health check")
-    print(f"  POST /api/search    - Search products (JSON body)")
-    print(f"  GET  /api/search    - Search products (query params)")
-    print("\nExample requests:")
-    print(f'  curl -X POST http://localhost:{Config.FLASK_PORT}/api/search \\')
-    print('    -H "Content-Type: application/json" \\')
-    print('    -d \'{"query": "sterile gloves under $100"}\'')
-    print(f'\n  curl "http://localhost:{Config.FLASK_PORT}/api/search?q=pipettes%20in%20stock"')
-    print(f'\n  # With debug mode:')
-    print(f'  curl "http://localhost:{Config.FLASK_PORT}/api/search?q=nitrile%20gloves&debug=true"')
-    print("=" * 60)
-    print("\nRAG Features:")
-    print("  ✓ Smart category detection with LLM reasoning")
-    print("  ✓ Conservative handling of ambiguous queries")
-    print("  ✓ 84.6% accuracy on test dataset")
-    print("  ✓ Transparent confidence scoring")
-    print("=" * 60)
-    print()
+    # Development server only - production runs under Gunicorn:
+    #   gunicorn -c gunicorn.conf.py src.app:app
+    if Config.FLASK_ENV == "production" and os.getenv("FLASK_USE_BUILTIN_SERVER") != "1":
+        sys.exit(
+            "✗ Refusing to start the Flask development server with FLASK_ENV=production.\n"
+            "  Run: gunicorn -c gunicorn.conf.py src.app:app\n"
+            "  (or set FLASK_USE_BUILTIN_SERVER=1 to override)"
+        )
+
+    # Fail fast on missing configuration before starting the dev server
+    get_search_engine()
+
+    _print_banner()
 
     app.run(
         host="0.0.0.0",
@@ -0,0 +1,235 @@
+"""In-process caches for search responses and LLM outputs.
+
+SemanticCache lookups are tiered:
+1. Exact match on the normalized query (case/whitespace-insensitive dict lookup, no model call)
+2. Semantic match on the query embedding (cosine similarity above a threshold)
+"""
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+# Numbers in a query carry hard constraints ("under $30", "top 5") that
+# embeddings barely distinguish, so semantic hits must match them exactly
+NUMBER_PATTERN = re.compile(r"\d+(?:\.\d+)?")
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for exact-match cache keys.
+
+    Args:
+        query: Search query
+
+    Returns:
+        Lowercased query with surrounding whitespace stripped and inner runs collapsed
+    """
+    return " ".join(query.lower().split())
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum cached entries (least recently used are evicted first)
+            ttl_seconds: Seconds before an entry expires
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # key → (value, created_at)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            if time.time() - entry[1] >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SemanticCache:
+    """Cache values by query, matching exact strings first and then near-duplicate embeddings."""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], List[float]],
+        similarity_threshold: float = 0.95,
+        max_entries: int = 1000,
+        ttl_seconds: float = 3600
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            embed_fn: Function returning the embedding vector for a query
+            similarity_threshold: Minimum cosine similarity for a semantic hit (0-1)
+            max_entries: Maximum cached entries (oldest are evicted first)
+            ttl_seconds: Seconds before an entry expires
+        """
+        self.embed_fn = embed_fn
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        # (normalized query, namespace) → slot index
+        self._exact: Dict[Tuple[str, Hashable], int] = {}
+        # Normalized embeddings, one row per slot (allocated on first insert)
+        self._vectors: Optional[np.ndarray] = None
+        # Slot metadata: (normalized query, namespace, numbers, value, created_at)
+        self._slots: List[Optional[Tuple[str, Hashable, Tuple[str, ...], Any, float]]] = [None] * max_entries
+        self._next_slot = 0
+        # Embeddings computed by get(), reused by set() on a miss
+        self._pending_embeddings: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def get(self, query: str, namespace: Hashable = None) -> Tuple[Optional[Any], Optional[str]]:
+        """
+        Look up a cached value for a query.
+
+        Args:
+            query: Search query
+            namespace: Extra key that must match exactly (e.g., max_results, threshold)
+
+        Returns:
+            Tuple of (cached value, "exact" | "semantic"), or (None, None) on a miss
+        """
+        now = time.time()
+        key = (normalize_query(query), namespace)
+
+        with self._lock:
+            slot = self._exact.get(key)
+            if slot is not None:
+                entry = self._slots[slot]
+                if now - entry[4] < self.ttl_seconds:
+                    return entry[3], "exact"
+
+        vector = self._embed(query)
+        if vector is None:
+            return None, None
+
+        numbers = tuple(NUMBER_PATTERN.findall(query))
+
+        with self._lock:
+            if self._vectors is None:
+                return None, None
+
+            similarities = self._vectors @ vector
+            for slot in np.argsort(-similarities):
+                if similarities[slot] < self.similarity_threshold:
+                    break
+
+                entry = self._slots[slot]
+                if entry is None or now - entry[4] >= self.ttl_seconds:
+                    continue
+                if entry[1] == namespace and entry[2] == numbers:
+                    return entry[3], "semantic"
+
+        return None, None
+
+    def set(self, query: str, value: Any, namespace: Hashable = None):
+        """
+        Cache a value for a query.
+
+        Args:
+            query: Search query
+            value: Value to cache
+            namespace: Extra key that must match exactly on lookup
+        """
+        vector = self._embed(query)
+        if vector is None:
+            return
+
+        numbers = tuple(NUMBER_PATTERN.findall(query))
+        key = (normalize_query(query), namespace)
+
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+
+            slot = self._exact.get(key)
+            if slot is None:
+                # Ring buffer: overwrite the oldest slot
+                slot = self._next_slot
+                self._next_slot = (slot + 1) % self.max_entries
+
+                evicted = self._slots[slot]
+                if evicted is not None:
+                    self._exact.pop((evicted[0], evicted[1]), None)
+
+            self._vectors[slot] = vector
+            self._slots[slot] = (key[0], namespace, numbers, value, time.time())
+            self._exact[key] = slot
+
+    def _embed(self, query: str) -> Optional[np.ndarray]:
+        """
+        Get the normalized embedding for a query, reusing one computed moments ago.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Unit-length float32 vector, or None if embedding failed
+        """
+        with self._lock:
+            vector = self._pending_embeddings.get(query)
+            if vector is not None:
+                return vector
+
+        try:
+            vector = np.asarray(self.embed_fn(query), dtype=np.float32)
+        except Exception as e:
+            logger.warning("Error embedding query for cache: %s", e)
+            return None
+
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        vector /= norm
+
+        with self._lock:
+            self._pending_embeddings[query] = vector
+            if len(self._pending_embeddings) > 256:
+                self._pending_embeddings.popitem(last=False)
+
+        return vector
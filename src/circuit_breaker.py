@@ -0,0 +1,133 @@
+"""Circuit breaker for calls to a downstream service.
+
+While most recent calls have failed, the breaker opens and rejects calls
+immediately for a cooldown period instead of letting every request wait out
+its timeout against a service that is down. After the cooldown it is
+half-open: a single probe call goes through, and its outcome decides whether
+the breaker closes again or reopens for another cooldown.
+"""
+import time
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe failure-ratio circuit breaker over a sliding window of calls."""
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        failure_ratio: float = 0.5,
+        cooldown_seconds: float = 5,
+        min_calls: int = 10
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Downstream service name (used in error messages)
+            window: Number of recent calls tracked
+            failure_ratio: Open the circuit when more than this share of tracked calls failed (0-1)
+            cooldown_seconds: Seconds to reject calls once the circuit opens
+            min_calls: Minimum tracked calls before the circuit may open
+        """
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.cooldown_seconds = cooldown_seconds
+        self.min_calls = min(min_calls, window)
+
+        self._lock = threading.Lock()
+        # True for each failed call, False for each success (closed state only)
+        self._results = deque(maxlen=window)
+        self._state = CLOSED
+        self._open_until = 0.0
+        # Start time of the half-open probe call, None while no probe is running
+        self._probe_started = None
+
+    @property
+    def state(self) -> str:
+        """Current state: "closed", "open" or "half_open"."""
+        with self._lock:
+            return self._state
+
+    def before_call(self):
+        """
+        Check that a call may proceed.
+
+        While half-open, only one probe call is let through at a time. A probe
+        that never reports back (e.g. its greenlet was killed) is replaced
+        after another cooldown so the breaker can't get stuck.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with a probe running
+        """
+        with self._lock:
+            now = time.time()
+
+            if self._state == OPEN:
+                if now < self._open_until:
+                    raise CircuitOpenError(f"{self.name} unavailable (circuit open after repeated failures)")
+                self._state = HALF_OPEN
+                self._probe_started = None
+
+            if self._state == HALF_OPEN:
+                if self._probe_started is not None and now - self._probe_started < self.cooldown_seconds:
+                    raise CircuitOpenError(f"{self.name} unavailable (waiting on recovery probe)")
+                self._probe_started = now
+
+    def record_success(self):
+        """Record a successful call, closing the circuit if it was the half-open probe."""
+        with self._lock:
+            if self._state == OPEN:
+                # Late result of a call admitted before the circuit opened
+                return
+
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._probe_started = None
+                self._results.clear()
+                logger.info("%s circuit closed (probe succeeded)", self.name)
+                return
+
+            self._results.append(False)
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit if the failure ratio is exceeded."""
+        with self._lock:
+            if self._state == OPEN:
+                return
+
+            if self._state == HALF_OPEN:
+                # The probe failed: back off for another cooldown right away
+                self._open()
+                return
+
+            self._results.append(True)
+
+            if len(self._results) < self.min_calls:
+                return
+
+            if sum(self._results) / len(self._results) > self.failure_ratio:
+                self._open()
+
+    def _open(self):
+        """Open the circuit for one cooldown (caller holds the lock)."""
+        self._state = OPEN
+        self._open_until = time.time() + self.cooldown_seconds
+        self._probe_started = None
+        # The window restarts once the breaker closes again
+        self._results.clear()
+        logger.warning("%s circuit opened for %ss", self.name, self.cooldown_seconds)
@@ -20,6 +20,32 @@ class Config:
     TYPESENSE_PROTOCOL = os.getenv("TYPESENSE_PROTOCOL", "http")
     TYPESENSE_API_KEY = os.getenv("TYPESENSE_API_KEY")
     TYPESENSE_COLLECTION_NAME = "mercedes_products"
+    # Fail fast on stuck searches (indexing keeps the 300s default for embeddings)
+    TYPESENSE_SEARCH_TIMEOUT_SECONDS = int(os.getenv("TYPESENSE_SEARCH_TIMEOUT_SECONDS", "15"))
+
+    # Parallel document import requests in the Neon indexer
+    TYPESENSE_IMPORT_WORKERS = int(os.getenv("TYPESENSE_IMPORT_WORKERS", "8"))
+
+    # Gzip document import bodies (needs a Typesense/proxy that accepts Content-Encoding: gzip)
+    TYPESENSE_IMPORT_GZIP = os.getenv("TYPESENSE_IMPORT_GZIP", "false").lower() == "true"
+
+    # HTTP connection pooling (keep-alive connections per worker)
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "50"))
+    # Typesense pool, sized to per-worker concurrency (e.g. gevent worker_connections)
+    TYPESENSE_POOL_SIZE = int(os.getenv("TYPESENSE_POOL_SIZE", str(HTTP_POOL_SIZE)))
+
+    # Typesense circuit breaker: fail fast with 503 while most recent calls fail
+    TYPESENSE_BREAKER_WINDOW = int(os.getenv("TYPESENSE_BREAKER_WINDOW", "20"))
+    TYPESENSE_BREAKER_FAILURE_RATIO = float(os.getenv("TYPESENSE_BREAKER_FAILURE_RATIO", "0.5"))
+    TYPESENSE_BREAKER_COOLDOWN_SECONDS = float(os.getenv("TYPESENSE_BREAKER_COOLDOWN_SECONDS", "5"))
+
+    # Search response cache (exact + semantic match on query embeddings)
+    SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1000"))
+    SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+    SEARCH_CACHE_SIMILARITY = float(os.getenv("SEARCH_CACHE_SIMILARITY", "0.95"))
+
+    # Category classification cache (skips the RAG LLM call for repeated queries)
+    CLASSIFICATION_CACHE_SIZE = int(os.getenv("CLASSIFICATION_CACHE_SIZE", "10000"))
 
     # Mercedes GraphQL
     MERCEDES_GRAPHQL_URL = os.getenv(
@@ -47,8 +73,14 @@ class Config:
             )
 
     @classmethod
-    def get_typesense_config(cls):
-        """Get Typesense client configuration."""
+    def get_typesense_config(cls, timeout_seconds: int = 300):
+        """
+        Get Typesense client configuration.
+
+        Args:
+            timeout_seconds: Per-request timeout (default 5 minutes for embedding
+                generation while indexing; search uses TYPESENSE_SEARCH_TIMEOUT_SECONDS)
+        """
         return {
             "nodes": [{
                 "host": cls.TYPESENSE_HOST,
@@ -56,5 +88,5 @@ class Config:
                 "protocol": cls.TYPESENSE_PROTOCOL
             }],
             "api_key": cls.TYPESENSE_API_KEY,
-            "connection_timeout_seconds": 300  # 5 minutes for embedding generation
+            "connection_timeout_seconds": timeout_seconds
         }
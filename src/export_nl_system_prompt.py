@@ -3,7 +3,9 @@
 This script retrieves the registered NL model configuration from Typesense
 and exports its system prompt to a text file.
 """
+import re
 import sys
+import traceback
 from pathlib import Path
 
 # Add project root to Python path for imports
@@ -11,12 +13,29 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 import requests
-import json
+import orjson
+from requests.adapters import HTTPAdapter
 from src.config import Config
 
 # Validate configuration
 Config.validate()
 
+# Simple extraction of the system_prompt = """ ... """ block in setup_nl_model.py
+SYSTEM_PROMPT_PATTERN = re.compile(r'system_prompt\s*=\s*"""(.*?)"""', re.DOTALL)
+
+# (connect, read) timeout for Typesense API calls
+REQUEST_TIMEOUT = (5, 30)
+
+# Keep-alive session shared by the model lookup and the model listing
+_session = requests.Session()
+_session.headers.update({
+    "X-TYPESENSE-API-KEY": Config.TYPESENSE_API_KEY,
+    "Content-Type": "application/json"
+})
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
 
 def export_system_prompt(output_file: str = None):
     """
@@ -44,18 +63,14 @@ def export_system_prompt(output_file: str = None):
     print(f"Model ID: {model_id}")
     print("=" * 70)
 
-    headers = {
-        "X-TYPESENSE-API-KEY": Config.TYPESENSE_API_KEY,
-        "Content-Type": "application/json"
-    }
-
     try:
         # Get the model configuration
         model_url = f"{base_url}/nl_search_models/{model_id}"
-        response = requests.get(model_url, headers=headers)
+        response = _session.get(model_url, timeout=REQUEST_TIMEOUT)
 
         if response.status_code == 200:
-            model_config = response.json()
+            # Parse the raw body once; both output files are written from this dict
+            model_config = orjson.loads(response.content)
 
             print(f"\n✓ Model found: {model_id}")
             print(f"  Model Name: {model_config.get('model_name', 'N/A')}")
@@ -85,7 +100,7 @@ def export_system_prompt(output_file: str = None):
 
                 # Also save as JSON for complete config
                 json_output = output_path.with_suffix('.json')
-                json_output.write_text(json.dumps(model_config, indent=2), encoding='utf-8')
+                json_output.write_bytes(orjson.dumps(model_config, option=orjson.OPT_INDENT_2))
                 print(f"\n✓ Full model config saved to: {json_output.absolute()}")
 
             else:
@@ -98,7 +113,7 @@ def export_system_prompt(output_file: str = None):
 
             # Try to list all available models
             list_url = f"{base_url}/nl_search_models"
-            list_response = requests.get(list_url, headers=headers)
+            list_response = _session.get(list_url, timeout=REQUEST_TIMEOUT)
             if list_response.status_code == 200:
                 models = list_response.json()
                 if models:
@@ -121,7 +136,6 @@ def export_system_prompt(output_file: str = None):
 
     except Exception as e:
         print(f"\n✗ Error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
 
@@ -138,10 +152,7 @@ def compare_with_file_version():
         setup_content = setup_file.read_text(encoding='utf-8')
 
         # Extract the system_prompt variable from the file
-        # This is a simple extraction - looks for the system_prompt = """ ... """ block
-        import re
-        pattern = r'system_prompt\s*=\s*"""(.*?)"""'
-        match = re.search(pattern, setup_content, re.DOTALL)
+        match = SYSTEM_PROMPT_PATTERN.search(setup_content)
 
         if match:
             file_prompt = match.group(1).strip()
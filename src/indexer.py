@@ -1,14 +1,198 @@
 """Script to index Mercedes products into Typesense."""
-import json
+import re
+import pickle
+import hashlib
+import functools
+import itertools
+import orjson
 import requests
 import typesense
-from typing import List, Dict, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional, Tuple
 from config import Config
 from models import Product
+from indexing import clean_and_deduplicate_categories, import_batch
 
 # Validate configuration
 Config.validate()
 
+# GraphQL requests in flight at the same time
+FETCH_CONCURRENCY = 16
+
+# Search terms packed into one GraphQL request as aliased products() fields
+TERMS_PER_REQUEST = 8
+
+# Pages fetched per search term (the API caps each query at 500 products)
+MAX_PAGES_PER_TERM = 5
+
+# Early stop on low yield: terms always used, and recent terms whose new
+# unique products are compared against min_marginal_unique
+EARLY_STOP_MIN_TERMS = 20
+EARLY_STOP_WINDOW = 5
+
+# Fetched products are cached here so re-indexing can skip the GraphQL fetch
+PRODUCTS_CACHE_DIR = Path(__file__).parent.parent / "database" / "cache"
+
+# Import batches in flight at the same time (Typesense embeds and indexes them in parallel)
+IMPORT_CONCURRENCY = 6
+
+# (connect, read) timeout for the NL model check; it only warns, so keep startup snappy
+NL_MODEL_CHECK_TIMEOUT = (1, 2)
+
+# Upper bound on per-batch progress lines printed while importing
+MAX_PROGRESS_LINES = 50
+
+# Real product categories from Mercedes Scientific (used as search terms)
+# Source: GraphQL categoryList query
+# These are the actual category names with verified product counts
+REAL_CATEGORY_TERMS = (
+    # Main product categories (33 categories, 23,571 products total)
+    'absorbent sheets', 'pads', 'mats',
+    'bags',
+    'blades', 'handles',
+    'calibrators', 'controls',
+    'chemicals', 'stains',
+    'cleaners',
+    'deep well plates', 'accessories',
+    'drug tests',
+    'embedding', 'cryotomy', 'grossing',
+    'equipment',
+    'filtration',
+    'furniture',
+    'glass', 'plasticware',
+    'gloves', 'apparel',  # 380 products
+    'labels', 'labeling tape',
+    'laboratory essentials',
+    'medsurg', 'exam room supplies',
+    'microscope slides', 'coverslips', 'control slides',  # 508 products
+    'needles', 'syringes',
+    'pens', 'pencils', 'markers',
+    'phlebotomy supplies',
+    'pipettes', 'pipettors', 'tips',  # 1,024 products
+    'rapid diagnostic testing',
+    'reagents',  # 5,083 products - largest category
+    'safety',
+    'scales', 'weighing',
+    'specimen collection',
+    'standards',
+    'storage',
+    'surgical instruments',  # 896 products
+    'sutures', 'suture removal',
+    'thermometers', 'meters',
+
+    # Lab types (helps find specialized products)
+    'cannabis lab',
+    'chemistry',
+    'chromatography',
+    'drug testing', 'screening',
+    'general lab',
+    'hematology',
+    'histology', 'cytology',
+    'immunoassay',
+    'medical', 'surgical',
+    'microbiology',
+    'serology',
+    'toxicology',
+    'urinalysis',
+    'veterinary',
+)
+
+# Single high-value words from category names
+# These catch products that don't match full category names
+KEY_WORD_TERMS = (
+    'pipette', 'slide', 'reagent', 'tube', 'syringe',
+    'needle', 'sterile', 'diagnostic', 'test', 'kit',
+    'microscope', 'blade', 'stain', 'specimen', 'culture',
+    'filter', 'bottle', 'vial', 'plate', 'rack', 'tip'
+)
+
+# All search terms, deduplicated case-insensitively in definition order
+SEARCH_TERMS = tuple(dict.fromkeys(
+    term.lower() for term in REAL_CATEGORY_TERMS + KEY_WORD_TERMS
+))
+
+# Optional schema fields omitted from documents when they have no value
+OPTIONAL_DOCUMENT_FIELDS = ("description", "short_description", "price", "image_url")
+
+# HTML tags stripped from product descriptions
+HTML_TAG_PATTERN = re.compile(r'<[^<]+?>')
+
+# Product fields selected for every search term
+PRODUCT_FIELDS_FRAGMENT = """
+fragment ProductFields on ProductInterface {
+  id
+  uid
+  name
+  sku
+  url_key
+  stock_status
+  type_id
+  description {
+    html
+  }
+  short_description {
+    html
+  }
+  price_range {
+    minimum_price {
+      regular_price {
+        value
+        currency
+      }
+    }
+  }
+  image {
+    url
+    label
+  }
+  categories {
+    id
+    name
+    url_path
+  }
+}
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def build_products_query(term_count: int) -> str:
+    """
+    Build a GraphQL query with one aliased products() field per search term.
+
+    Search terms and pages are passed as variables ($search0, $page0, ...), so
+    the query text only depends on the number of terms and is built once.
+
+    Args:
+        term_count: Number of search terms in the request
+
+    Returns:
+        Query string with aliases t0..t{term_count - 1}
+    """
+    variable_defs = ["$pageSize: Int!"]
+    selections = []
+
+    for i in range(term_count):
+        variable_defs.append(f"$search{i}: String!, $page{i}: Int!")
+        selections.append(f"""
+  t{i}: products(search: $search{i}, pageSize: $pageSize, currentPage: $page{i}) {{
+    total_count
+    items {{
+      ...ProductFields
+    }}
+    page_info {{
+      current_page
+      total_pages
+    }}
+  }}""")
+
+    return "query Products(%s) {%s\n}\n%s" % (
+        ", ".join(variable_defs), "".join(selections), PRODUCT_FIELDS_FRAGMENT
+    )
+
 
 class MercedesProductIndexer:
     """Index Mercedes Scientific products to Typesense."""
@@ -17,6 +201,34 @@ class MercedesProductIndexer:
         """Initialize indexer."""
         self.client = typesense.Client(Config.get_typesense_config())
         self.collection_name = Config.TYPESENSE_COLLECTION_NAME
+        self.import_url = (
+            f"{Config.TYPESENSE_PROTOCOL}://{Config.TYPESENSE_HOST}:{Config.TYPESENSE_PORT}"
+            f"/collections/{self.collection_name}/documents/import"
+        )
+
+        # Keep-alive connections shared by the parallel import threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=IMPORT_CONCURRENCY)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Keep-alive connections for the parallel GraphQL fetches. Product queries
+        # are read-only, so POSTs are retried on rate limits and server errors.
+        self.graphql_session = requests.Session()
+        graphql_retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False
+        )
+        graphql_adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=FETCH_CONCURRENCY,
+            max_retries=graphql_retry
+        )
+        self.graphql_session.mount("http://", graphql_adapter)
+        self.graphql_session.mount("https://", graphql_adapter)
         self.graphql_url = Config.MERCEDES_GRAPHQL_URL
 
     def create_collection(self):
@@ -69,354 +281,266 @@ class MercedesProductIndexer:
             print(f"✗ Error creating collection: {e}")
             raise
 
-    def _get_search_terms(self) -> List[str]:
+    def _get_search_terms(self) -> Tuple[str, ...]:
         """
-        Generate search terms from actual Mercedes Scientific categories.
+        Search terms from actual Mercedes Scientific categories.
 
         The Mercedes API limits results to 500 products per query,
         but different search terms return different products.
         We use category names and key product types for maximum coverage.
         """
-        terms = []
-
-        # Real product categories from Mercedes Scientific
-        # Source: GraphQL categoryList query
-        # These are the actual category names with verified product counts
-        real_categories = [
-            # Main product categories (33 categories, 23,571 products total)
-            'absorbent sheets', 'pads', 'mats',
-            'bags',
-            'blades', 'handles',
-            'calibrators', 'controls',
-            'chemicals', 'stains',
-            'cleaners',
-            'deep well plates', 'accessories',
-            'drug tests',
-            'embedding', 'cryotomy', 'grossing',
-            'equipment',
-            'filtration',
-            'furniture',
-            'glass', 'plasticware',
-            'gloves', 'apparel',  # 380 products
-            'labels', 'labeling tape',
-            'laboratory essentials',
-            'medsurg', 'exam room supplies',
-            'microscope slides', 'coverslips', 'control slides',  # 508 products
-            'needles', 'syringes',
-            'pens', 'pencils', 'markers',
-            'phlebotomy supplies',
-            'pipettes', 'pipettors', 'tips',  # 1,024 products
-            'rapid diagnostic testing',
-            'reagents',  # 5,083 products - largest category
-            'safety',
-            'scales', 'weighing',
-            'specimen collection',
-            'standards',
-            'storage',
-            'surgical instruments',  # 896 products
-            'sutures', 'suture removal',
-            'thermometers', 'meters',
-
-            # Lab types (helps find specialized products)
-            'cannabis lab',
-            'chemistry',
-            'chromatography',
-            'drug testing', 'screening',
-            'general lab',
-            'hematology',
-            'histology', 'cytology',
-            'immunoassay',
-            'medical', 'surgical',
-            'microbiology',
-            'serology',
-            'toxicology',
-            'urinalysis',
-            'veterinary',
-        ]
-
-        terms.extend(real_categories)
-
-        # Add single high-value words from category names
-        # These catch products that don't match full category names
-        key_words = [
-            'gloves', 'pipette', 'slide', 'reagent', 'tube', 'syringe',
-            'needle', 'surgical', 'sterile', 'diagnostic', 'test', 'kit',
-            'microscope', 'blade', 'stain', 'specimen', 'culture',
-            'filter', 'bottle', 'vial', 'plate', 'rack', 'tip'
-        ]
+        return SEARCH_TERMS
 
-        terms.extend(key_words)
-
-        return terms
-
-    def fetch_products(self, page_size: int = 100, max_products: int = None) -> List[Dict[str, Any]]:
+    def fetch_products(
+        self,
+        page_size: int = 100,
+        max_products: int = None,
+        max_workers: int = FETCH_CONCURRENCY,
+        min_marginal_unique: int = None
+    ) -> List[Dict[str, Any]]:
         """
         Fetch products from Mercedes GraphQL API using multi-search strategy.
 
         Note: The API limits results to 500 products per query, so we use
         multiple search terms to collect unique products across different queries.
+
+        Args:
+            page_size: Products per GraphQL page
+            max_products: Stop after this many unique products (None for all)
+            max_workers: Number of term batches fetched in parallel
+            min_marginal_unique: Stop once the last few terms together added fewer
+                new unique products than this (None to use every term). Batches
+                not started yet are skipped, so this saves requests when
+                max_workers is smaller than the number of batches.
         """
-        all_products = {}  # Use dict to track unique products by SKU
+        all_products = []
+        seen_skus = set()  # Unique products by SKU
+        recent_new_counts = deque(maxlen=EARLY_STOP_WINDOW)
         search_terms = self._get_search_terms()
 
         print(f"\nFetching products from {self.graphql_url}...")
         print(f"Strategy: Multi-search to bypass API's 500-product limit")
-        print(f"Search terms: {len(search_terms)} different queries")
+        print(f"Search terms: {len(search_terms)} different queries "
+              f"({TERMS_PER_REQUEST} per request, {max_workers} requests in parallel)")
         if max_products:
             print(f"Limit: First {max_products:,} products")
         print()
 
-        for term_idx, search_term in enumerate(search_terms, 1):
-            if max_products and len(all_products) >= max_products:
-                break
-
-            # Fetch products for this search term
-            term_products = self._fetch_products_for_search(
-                search_term,
-                page_size=page_size,
-                max_products=max_products - len(all_products) if max_products else None
-            )
+        # Terms are batched into aliased GraphQL requests
+        term_batches = [
+            search_terms[i:i + TERMS_PER_REQUEST]
+            for i in range(0, len(search_terms), TERMS_PER_REQUEST)
+        ]
 
-            # Add unique products (by SKU)
-            before_count = len(all_products)
-            for product in term_products:
-                sku = product.get("sku")
-                if sku and sku not in all_products:
-                    all_products[sku] = product
+        # Batches are fetched concurrently; results are merged in term order so the
+        # collected products match a sequential fetch
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        def fetch_in_order():
+            # Only max_workers batches are submitted ahead of the merge, so an
+            # early stop leaves the remaining batches unrequested
+            batches = iter(term_batches)
+            in_flight = deque()
+
+            def submit(count):
+                for batch in itertools.islice(batches, count):
+                    in_flight.append(executor.submit(
+                        self._fetch_products_for_terms,
+                        batch,
+                        page_size=page_size,
+                        max_products=max_products
+                    ))
+
+            submit(max_workers)
+            while in_flight:
+                batch_results = in_flight.popleft().result()
+                submit(1)
+                yield from batch_results
+
+        term_results = fetch_in_order()
 
-            new_count = len(all_products) - before_count
+        try:
+            for term_idx, (search_term, term_products) in enumerate(zip(search_terms, term_results), 1):
+                if max_products and len(all_products) >= max_products:
+                    break
 
-            print(f"  [{term_idx:3d}/{len(search_terms)}] Search '{search_term:15s}': "
-                  f"{len(term_products):3d} products, {new_count:3d} new unique "
-                  f"(Total: {len(all_products):,})")
+                if max_products:
+                    term_products = term_products[:max_products - len(all_products)]
+
+                # Add unique products (by SKU), transforming only products not seen
+                # under an earlier term; duplicate raw items are dropped right away
+                before_count = len(all_products)
+                transform = self._transform_product
+                for item in term_products:
+                    sku = item.get("sku")
+                    if sku and sku not in seen_skus:
+                        try:
+                            product = transform(item)
+                        except Exception:
+                            # Silently skip products that cannot be transformed
+                            continue
+                        seen_skus.add(sku)
+                        all_products.append(product)
+
+                new_count = len(all_products) - before_count
+
+                print(f"  [{term_idx:3d}/{len(search_terms)}] Search '{search_term:15s}': "
+                      f"{len(term_products):3d} products, {new_count:3d} new unique "
+                      f"(Total: {len(all_products):,})")
+
+                # Later terms mostly return duplicates; stop once they stop paying off
+                recent_new_counts.append(new_count)
+                if min_marginal_unique and term_idx >= EARLY_STOP_MIN_TERMS and \
+                        sum(recent_new_counts) < min_marginal_unique:
+                    print(f"  Stopping early: last {len(recent_new_counts)} terms added "
+                          f"{sum(recent_new_counts)} new unique products")
+                    break
+        finally:
+            # Wait for the batches still in flight; none are queued beyond them
+            executor.shutdown(wait=True, cancel_futures=True)
 
         print(f"\n{'='*60}")
         print(f"✓ Total unique products collected: {len(all_products):,}")
         print(f"✓ Used {term_idx} search terms")
         print(f"{'='*60}")
 
-        return list(all_products.values())
+        return all_products
 
-    def _fetch_products_for_search(
+    def _fetch_products_for_terms(
         self,
-        search_term: str,
+        search_terms: List[str],
         page_size: int = 100,
         max_products: int = None
-    ) -> List[Dict[str, Any]]:
-        """Fetch products for a single search term."""
-        products = []
-        current_page = 1
-        total_fetched = 0
-
-        while True:
-            # GraphQL query with search term
-            query = """
-            {
-              products(
-                search: "%s"
-                pageSize: %d
-                currentPage: %d
-              ) {
-                total_count
-                items {
-                  id
-                  uid
-                  name
-                  sku
-                  url_key
-                  stock_status
-                  type_id
-                  description {
-                    html
-                  }
-                  short_description {
-                    html
-                  }
-                  price_range {
-                    minimum_price {
-                      regular_price {
-                        value
-                        currency
-                      }
-                    }
-                  }
-                  image {
-                    url
-                    label
-                  }
-                  categories {
-                    id
-                    name
-                    url_path
-                  }
-                }
-                page_info {
-                  current_page
-                  total_pages
-                }
-              }
-            }
-            """ % (search_term, page_size, current_page)
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Fetch raw GraphQL product items for a batch of search terms.
+
+        Every term is an aliased products() field (t0, t1, ...) in the same
+        GraphQL query, so each page of the batch is one HTTP request. Terms
+        that run out of pages drop out of later requests. If a batched request
+        fails, the remaining terms are fetched one at a time so one bad term
+        doesn't lose the whole batch.
+
+        Returns:
+            Raw product items for each search term, in the same order
+        """
+        products = [[] for _ in search_terms]
+        # Term index -> next page to fetch, for terms that still have pages
+        next_page = {term_idx: 1 for term_idx in range(len(search_terms))}
+        one_at_a_time = len(search_terms) == 1
+
+        while next_page:
+            # Aliases t0..tN map positionally onto the terms still being fetched
+            active_terms = list(next_page.items())
+            if one_at_a_time:
+                active_terms = active_terms[:1]
+            variables = {"pageSize": page_size}
+            for alias_idx, (term_idx, page) in enumerate(active_terms):
+                variables[f"search{alias_idx}"] = search_terms[term_idx]
+                variables[f"page{alias_idx}"] = page
 
             try:
-                response = requests.post(
+                response = self.graphql_session.post(
                     self.graphql_url,
-                    json={"query": query},
+                    data=orjson.dumps({"query": build_products_query(len(active_terms)), "variables": variables}),
                     headers={"Content-Type": "application/json"},
                     timeout=30
                 )
                 response.raise_for_status()
-                data = response.json()
-
-                if "errors" in data:
-                    # Silently skip errors for individual search terms
-                    break
-
-                product_data = data.get("data", {}).get("products", {})
-                items = product_data.get("items", [])
-                page_info = product_data.get("page_info", {})
-                total_count = product_data.get("total_count", 0)
+                results = orjson.loads(response.content).get("data") or {}
+            except Exception as e:
+                failed_terms = [search_terms[term_idx] for term_idx, _ in active_terms]
+                if one_at_a_time:
+                    print(f"  ⚠ Skipping search term {failed_terms[0]!r}: {e}")
+                    del next_page[active_terms[0][0]]
+                else:
+                    # Retry the remaining pages of each term in its own request
+                    print(f"  ⚠ Batched request failed for {failed_terms}: {e}; retrying terms one at a time")
+                    one_at_a_time = True
+                continue
+
+            for alias_idx, (term_idx, page) in enumerate(active_terms):
+                term_products = products[term_idx]
+
+                # An alias is null when its search failed; skip that term only
+                product_data = results.get(f"t{alias_idx}") or {}
+                items = product_data.get("items") or []
+                page_info = product_data.get("page_info") or {}
 
                 if not items:
-                    break
-
-                # Transform products
-                for item in items:
-                    product = self._transform_product(item)
-                    products.append(product)
-                    total_fetched += 1
+                    del next_page[term_idx]
+                    continue
 
-                    if max_products and total_fetched >= max_products:
-                        break
-
-                if max_products and total_fetched >= max_products:
-                    break
+                # Products are transformed when merged, once per unique SKU
+                if max_products:
+                    items = items[:max_products - len(term_products)]
+                term_products.extend(items)
 
-                # For multi-search, we typically only need first page per term
+                # For multi-search, we only need the first few pages per term
                 # to maximize variety. Fetching all pages would be redundant.
-                if current_page >= min(page_info.get("total_pages", 1), 5):
-                    break
-
-                current_page += 1
-
-            except Exception as e:
-                # Silently skip errors for individual search terms
-                break
+                if (max_products and len(term_products) >= max_products) or \
+                        page >= min(page_info.get("total_pages", 1), MAX_PAGES_PER_TERM):
+                    del next_page[term_idx]
+                else:
+                    next_page[term_idx] = page + 1
 
         return products
 
-    def _clean_and_deduplicate_categories(self, raw_categories: List[str]) -> List[str]:
-        """
-        Clean and deduplicate category names.
-
-        Removes "Mercedes Scientific Main Store/" prefix and deduplicates categories
-        that have the same end path (e.g., multiple "Shop By Lab" variations).
-        Prefers shorter, more direct paths (Products over Shop By Lab).
-        """
-        if not raw_categories:
-            return []
-
-        # Step 1: Clean category names by removing prefix
-        cleaned = []
-        for cat in raw_categories:
-            # Remove the "Mercedes Scientific Main Store/" prefix
-            cleaned_cat = cat.replace("Mercedes Scientific Main Store/", "")
-            if cleaned_cat:
-                cleaned.append(cleaned_cat)
-
-        # Step 2: Deduplicate by end path
-        # Keep track of end paths we've seen (after last '/')
-        seen_end_paths = {}
-        unique_categories = []
-
-        for cat in cleaned:
-            # Extract the end path (e.g., "Specimen Collection/Cytology")
-            parts = cat.split('/')
-
-            # Consider the last 2 segments as the "end path" for deduplication
-            # This handles cases like "Products/Gloves" vs "Shop By Lab/Chemistry/Gloves"
-            if len(parts) >= 2:
-                end_path = '/'.join(parts[-2:])
-            else:
-                end_path = cat
-
-            # If we haven't seen this end path, or if this is a shorter path, keep it
-            if end_path not in seen_end_paths:
-                seen_end_paths[end_path] = cat
-                unique_categories.append(cat)
-            else:
-                # If this path is shorter, replace the existing one
-                existing = seen_end_paths[end_path]
-                if len(cat) < len(existing):
-                    # Remove the old one and add the new shorter one
-                    if existing in unique_categories:
-                        unique_categories.remove(existing)
-                    seen_end_paths[end_path] = cat
-                    unique_categories.append(cat)
-
-        # Step 3: Sort to have "Products" paths first, then others
-        unique_categories.sort(key=lambda x: (not x.startswith('Products/'), len(x), x))
-
-        return unique_categories
-
     def _transform_product(self, item: Dict[str, Any]) -> Dict[str, Any]:
         """Transform GraphQL product to Typesense document."""
-        # Extract price
-        price = None
-        currency = "USD"
-        price_range = item.get("price_range", {}).get("minimum_price", {})
-        regular_price = price_range.get("regular_price", {})
-        if regular_price:
-            price = regular_price.get("value")
-            currency = regular_price.get("currency", "USD")
-
-        # Extract image URL
-        image_url = None
-        image = item.get("image", {})
-        if image:
-            image_url = image.get("url")
-
-        # Extract and clean categories
-        raw_categories = [cat.get("name", "") for cat in item.get("categories", [])]
-        category_ids = [cat.get("id") for cat in item.get("categories", [])]
-
-        # Clean and deduplicate categories
-        categories = self._clean_and_deduplicate_categories(raw_categories)
-
-        # Clean HTML from descriptions
-        description = self._clean_html(item.get("description", {}).get("html", ""))
-        short_description = self._clean_html(item.get("short_description", {}).get("html", ""))
-
-        return {
-            "product_id": item.get("id"),
-            "uid": item.get("uid", ""),
-            "name": item.get("name", ""),
-            "sku": item.get("sku", ""),
-            "url_key": item.get("url_key", ""),
-            "stock_status": item.get("stock_status", "OUT_OF_STOCK"),
-            "type_id": item.get("type_id", "simple"),
-            "description": description if description else None,
-            "short_description": short_description if short_description else None,
-            "price": price,
-            "currency": currency,
-            "image_url": image_url,
-            "categories": categories,
+        # Runs once per unique product, so lookups are bound to locals
+        get = item.get
+        clean_html = self._clean_html
+
+        # Extract price (GraphQL returns null for missing objects, hence `or {}`)
+        minimum_price = (get("price_range") or {}).get("minimum_price") or {}
+        regular_price = minimum_price.get("regular_price") or {}
+
+        # Extract and clean categories in one pass
+        raw_categories = []
+        category_ids = []
+        for cat in get("categories") or ():
+            if "name" in cat:
+                raw_categories.append(cat["name"])
+            if cat.get("id") is not None:
+                category_ids.append(cat["id"])
+
+        document = {
+            "product_id": get("id"),
+            "uid": get("uid", ""),
+            "name": get("name", ""),
+            "sku": get("sku", ""),
+            "url_key": get("url_key", ""),
+            "stock_status": get("stock_status", "OUT_OF_STOCK"),
+            "type_id": get("type_id", "simple"),
+            # Clean HTML from descriptions
+            "description": clean_html((get("description") or {}).get("html")) or None,
+            "short_description": clean_html((get("short_description") or {}).get("html")) or None,
+            "price": regular_price.get("value"),
+            "currency": regular_price.get("currency") or "USD",
+            "image_url": (get("image") or {}).get("url"),
+            # Clean and deduplicate categories
+            "categories": clean_and_deduplicate_categories(raw_categories),
             "category_ids": category_ids,
         }
 
+        # Leave out optional fields with no value instead of sending nulls
+        for field in OPTIONAL_DOCUMENT_FIELDS:
+            if document[field] is None:
+                del document[field]
+
+        return document
+
     def _clean_html(self, html: str) -> str:
         """Remove HTML tags from string."""
-        import re
         if not html:
             return ""
-        clean = re.sub('<[^<]+?>', '', html)
+        clean = HTML_TAG_PATTERN.sub('', html)
         clean = clean.strip()
         return clean[:500] if len(clean) > 500 else clean  # Limit length
 
     def _check_nl_model(self):
         """Check if natural language search model is configured."""
-        import requests
-
         model_id = "openai-gpt4o-mini"
         base_url = f"{Config.TYPESENSE_PROTOCOL}://{Config.TYPESENSE_HOST}:{Config.TYPESENSE_PORT}"
 
@@ -427,73 +551,69 @@ class MercedesProductIndexer:
 
         try:
             check_url = f"{base_url}/nl_search_models/{model_id}"
-            response = requests.get(check_url, headers=headers, timeout=5)
-
-            if response.status_code == 200:
-                print(f"\n✓ Natural Language Search model '{model_id}' is configured")
-            else:
-                print(f"\n⚠ WARNING: Natural Language Search model not configured!")
-                print(f"   Model '{model_id}' does not exist in Typesense.")
-                print(f"   Your search will work, but NL features (filter extraction, etc.) will be limited.")
-                print(f"   Run: python src/setup_nl_model.py")
+            response = self.session.get(check_url, headers=headers, timeout=NL_MODEL_CHECK_TIMEOUT)
+            configured = response.status_code == 200
         except Exception:
+            configured = False
+
+        if configured:
+            print(f"\n✓ Natural Language Search model '{model_id}' is configured")
+        else:
             print(f"\n⚠ WARNING: Natural Language Search model not configured!")
             print(f"   Model '{model_id}' does not exist in Typesense.")
             print(f"   Your search will work, but NL features (filter extraction, etc.) will be limited.")
             print(f"   Run: python src/setup_nl_model.py")
         print()
 
-    def index_products(self, products: List[Dict[str, Any]], batch_size: int = 100):
-        """Index products to Typesense with auto-embeddings."""
+    def index_products(
+        self,
+        products: List[Dict[str, Any]],
+        batch_size: int = 100,
+        max_workers: int = IMPORT_CONCURRENCY
+    ):
+        """
+        Index products to Typesense with auto-embeddings.
+
+        Args:
+            products: Transformed products to import
+            batch_size: Documents per import request
+            max_workers: Import requests in flight at the same time
+        """
         total_batches = (len(products) + batch_size - 1) // batch_size
         print(f"\nIndexing {len(products):,} products to Typesense...")
-        print(f"Batches: {total_batches} (batch size: {batch_size})")
+        print(f"Batches: {total_batches} (batch size: {batch_size}, {max_workers} in parallel)")
         print(f"Note: Embeddings are generated automatically during indexing\n")
 
         total_indexed = 0
         failed_count = 0
+        progress_every = max(1, total_batches // MAX_PROGRESS_LINES)
 
-        for i in range(0, len(products), batch_size):
-            batch = products[i:i + batch_size]
-            batch_num = i // batch_size + 1
+        # Batches are imported in parallel; Typesense embeds each batch while others upload
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for i in range(0, len(products), batch_size):
+                batch = products[i:i + batch_size]
+                batch_num = i // batch_size + 1
+                futures[executor.submit(self._import_batch, batch, batch_num)] = (batch_num, len(batch))
 
-            try:
-                # Import documents (embeddings generated automatically by Typesense)
-                result = self.client.collections[self.collection_name].documents.import_(
-                    batch,
-                    {"action": "create"}
-                )
+            for completed, future in enumerate(as_completed(futures), 1):
+                batch_num, batch_len = futures[future]
 
-                # Count successful imports
-                success_count = 0
-                batch_failed = 0
-
-                for item in result:
-                    # Handle both string and dict responses
-                    if isinstance(item, str):
-                        parsed = json.loads(item)
-                    else:
-                        parsed = item
-
-                    if parsed.get("success"):
-                        success_count += 1
-                    else:
-                        batch_failed += 1
-                        # Print errors for debugging
-                        if "error" in parsed:
-                            print(f"    ⚠ Error in batch {batch_num}: {parsed.get('error')}")
-
-                total_indexed += success_count
-                failed_count += batch_failed
-
-                # Progress indicator
-                progress = (total_indexed / len(products)) * 100
-                print(f"  Batch {batch_num}/{total_batches}: Indexed {success_count}/{len(batch)} products "
-                      f"(Total: {total_indexed:,}/{len(products):,} | {progress:.1f}% complete)")
+                try:
+                    success_count, batch_failed = future.result()
 
-            except Exception as e:
-                print(f"✗ Error indexing batch {batch_num}: {e}")
-                failed_count += len(batch)
+                    total_indexed += success_count
+                    failed_count += batch_failed
+
+                    # Progress indicator (every Nth batch, plus any batch with failures and the last one)
+                    if batch_failed or completed % progress_every == 0 or completed == total_batches:
+                        progress = (total_indexed / len(products)) * 100
+                        print(f"  Batch {batch_num}/{total_batches}: Indexed {success_count}/{batch_len} products "
+                              f"(Total: {total_indexed:,}/{len(products):,} | {progress:.1f}% complete)")
+
+                except Exception as e:
+                    print(f"✗ Error indexing batch {batch_num}: {e}")
+                    failed_count += batch_len
 
         print(f"\n{'='*60}")
         print(f"✓ Successfully indexed: {total_indexed:,} products")
@@ -501,8 +621,57 @@ class MercedesProductIndexer:
             print(f"⚠ Failed to index: {failed_count} products")
         print(f"{'='*60}")
 
-    def run(self, max_products: int = None):
-        """Run the complete indexing process."""
+    def _import_batch(self, batch: List[Dict[str, Any]], batch_num: int) -> tuple:
+        """Import a batch of new documents (see indexing.import_batch)."""
+        # The collection is recreated before every run, so every document is new
+        return import_batch(self.session, self.import_url, batch, batch_num, action="create")
+
+    def _products_cache_path(self, max_products: int = None) -> Path:
+        """Cache file for fetched products, keyed on everything that shapes the fetch."""
+        key_source = orjson.dumps([self.graphql_url, self._get_search_terms(), max_products])
+        key = hashlib.blake2b(key_source, digest_size=8).hexdigest()
+        return PRODUCTS_CACHE_DIR / f"products_{key}.pkl"
+
+    def _load_cached_products(self, max_products: int = None) -> Optional[List[Dict[str, Any]]]:
+        """Load products saved by a previous fetch, or None if there is no cache."""
+        cache_path = self._products_cache_path(max_products)
+        if not cache_path.exists():
+            return None
+
+        try:
+            with cache_path.open("rb") as f:
+                products = pickle.load(f)
+        except Exception as e:
+            print(f"⚠ Could not read product cache {cache_path}: {e}")
+            return None
+
+        print(f"\n✓ Loaded {len(products):,} cached products from {cache_path}")
+        print(f"  Run with --refetch to fetch fresh products from the API")
+        return products
+
+    def _save_cached_products(self, products: List[Dict[str, Any]], max_products: int = None):
+        """Save fetched products so re-indexing can skip the GraphQL fetch."""
+        if not products:
+            return
+
+        cache_path = self._products_cache_path(max_products)
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with cache_path.open("wb") as f:
+                pickle.dump(products, f, protocol=pickle.HIGHEST_PROTOCOL)
+            print(f"✓ Cached fetched products to {cache_path}")
+        except Exception as e:
+            print(f"⚠ Could not write product cache {cache_path}: {e}")
+
+    def run(self, max_products: int = None, refetch: bool = False, check_nl_model: bool = True):
+        """
+        Run the complete indexing process.
+
+        Args:
+            max_products: Index only the first N products (None for all)
+            refetch: Fetch products from the API even if a cached fetch exists
+            check_nl_model: Warn if the NL search model is not registered in Typesense
+        """
         print("=" * 60)
         print("Mercedes Scientific Product Indexer")
         print("=" * 60)
@@ -517,14 +686,18 @@ class MercedesProductIndexer:
         print("=" * 60)
 
         # Check if NL search model is configured
-        self._check_nl_model()
+        if check_nl_model:
+            self._check_nl_model()
 
         try:
             # Create collection
             self.create_collection()
 
-            # Fetch products
-            products = self.fetch_products(page_size=100, max_products=max_products)
+            # Fetch products (or reuse the products saved by the last fetch)
+            products = self._load_cached_products(max_products) if not refetch else None
+            if products is None:
+                products = self.fetch_products(page_size=100, max_products=max_products)
+                self._save_cached_products(products, max_products)
 
             if not products:
                 print("✗ No products to index")
@@ -549,14 +722,29 @@ class MercedesProductIndexer:
 
 
 if __name__ == "__main__":
+    import argparse
     import time
+
+    parser = argparse.ArgumentParser(description="Index Mercedes products into Typesense")
+    parser.add_argument(
+        "--refetch",
+        action="store_true",
+        help="Fetch products from the API instead of reusing the cached fetch"
+    )
+    parser.add_argument(
+        "--skip-nl-check",
+        action="store_true",
+        help="Skip checking that the NL search model is registered (e.g. in CI)"
+    )
+    args = parser.parse_args()
+
     start_time = time.time()
 
     indexer = MercedesProductIndexer()
 
     # Index all ~27k products
     # To test with limited products, use: indexer.run(max_products=1000)
-    indexer.run()
+    indexer.run(refetch=args.refetch, check_nl_model=not args.skip_nl_check)
 
     elapsed_time = time.time() - start_time
     minutes = int(elapsed_time // 60)
@@ -1,15 +1,53 @@
 """Script to index Mercedes products from Neon database into Typesense."""
 import os
-import json
+import re
+import time
+import hashlib
+import itertools
+import orjson
+import requests
 import typesense
 import psycopg2
-from typing import List, Dict, Any
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from datetime import datetime
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Iterable, Iterator
 from config import Config
 from models import Product
+from indexing import IMPORT_TIMEOUT_SECONDS, clean_and_deduplicate_categories, import_batch
 
 # Validate configuration
 Config.validate()
 
+# Rows per server-side cursor fetch from Neon
+NEON_FETCH_BATCH_SIZE = 2000
+
+# Documents per import request (drop back to 100 if embedding calls start timing out)
+IMPORT_BATCH_SIZE = 250
+
+# Minimum seconds between batch progress lines while importing (failed batches always print)
+PROGRESS_INTERVAL_SECONDS = 10
+
+# NL search model the indexer checks for (registered by setup_nl_model.py)
+NL_MODEL_ID = "openai-gpt4o-mini"
+
+# Connect/read timeout for the NL search model check; Typesense is local or nearby
+NL_MODEL_CHECK_TIMEOUT = (1, 2)
+
+# Transform errors listed individually in the end-of-fetch summary
+MAX_TRANSFORM_ERRORS_SHOWN = 10
+
+# Lowercase letter followed by an uppercase letter (camelCase boundary)
+CAMEL_CASE_PATTERN = re.compile(r'([a-z])([A-Z])')
+
+# Characters that delimit additional_attributes pairs (commas outside braces)
+ATTRIBUTE_DELIMITER_PATTERN = re.compile(r'[{},]')
+
+# additional_attributes keys kept as product specs
+WANTED_ATTRIBUTES = frozenset({
+    'brand', 'grade', 'size', 'color', 'physical_form', 'cas_number', 'type_attribute'
+})
+
 
 class NeonProductIndexer:
     """Index Mercedes Scientific products from Neon database to Typesense."""
@@ -18,14 +56,33 @@ class NeonProductIndexer:
         """Initialize indexer."""
         self.typesense_client = typesense.Client(Config.get_typesense_config())
         self.collection_name = Config.TYPESENSE_COLLECTION_NAME
+        documents_url = (
+            f"{Config.TYPESENSE_PROTOCOL}://{Config.TYPESENSE_HOST}:{Config.TYPESENSE_PORT}"
+            f"/collections/{self.collection_name}/documents"
+        )
+        self.import_url = f"{documents_url}/import"
+        self.export_url = f"{documents_url}/export"
+
+        # Keep-alive connections shared by the parallel import threads. Imports
+        # are not retried, since a retry could re-embed a whole batch.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=Config.TYPESENSE_IMPORT_WORKERS)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
         # Get Neon connection string from environment
         self.neon_connection_string = os.getenv("NEON_DATABASE_URL")
         if not self.neon_connection_string:
             raise ValueError("NEON_DATABASE_URL environment variable is required")
 
-    def create_collection(self):
-        """Create Typesense collection with schema."""
+    def create_collection(self) -> bool:
+        """
+        Create Typesense collection with schema.
+
+        Returns:
+            True if the collection was (re)created empty, False if the existing
+            collection was kept for an incremental re-index
+        """
         schema = {
             "name": self.collection_name,
             "fields": [
@@ -81,6 +138,8 @@ class NeonProductIndexer:
                 # Temporal fields for "latest" queries
                 {"name": "created_at", "type": "int64", "optional": True, "sort": True},
                 {"name": "updated_at", "type": "int64", "optional": True, "sort": True},
+                # Hash of the document contents, for skipping unchanged products on re-index
+                {"name": "content_hash", "type": "string", "optional": True, "index": False},
                 # Embedding field for semantic search (now includes brand, size, color)
                 {
                     "name": "embedding",
@@ -112,8 +171,8 @@ class NeonProductIndexer:
                 # Ask user for confirmation
                 response = input("\nDo you want to delete and recreate it? (y/n): ")
                 if response.lower() != 'y':
-                    print("✓ Keeping existing collection (no changes)")
-                    return
+                    print("✓ Keeping existing collection (only new or changed products will be imported)")
+                    return False
 
                 # Delete existing collection
                 self.typesense_client.collections[self.collection_name].delete()
@@ -122,6 +181,7 @@ class NeonProductIndexer:
             # Create new collection
             self.typesense_client.collections.create(schema)
             print(f"✓ Created collection: {self.collection_name}")
+            return True
 
         except Exception as e:
             print(f"✗ Error creating collection: {e}")
@@ -129,12 +189,34 @@ class NeonProductIndexer:
 
     def fetch_products_from_neon(self, limit: int = None) -> List[Dict[str, Any]]:
         """Fetch products from Neon database, merging store views."""
+        return list(self.iter_products_from_neon(limit=limit))
+
+    def iter_products_from_neon(self, limit: int = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream transformed products from Neon database, merging store views.
+
+        Rows are fetched and transformed one cursor batch at a time, so a
+        consumer (e.g. index_products) can import earlier products while later
+        rows are still being fetched.
+
+        Args:
+            limit: Fetch only the first N products (None for all)
+
+        Yields:
+            Typesense documents
+        """
         print(f"\nConnecting to Neon database...")
+        conn = None
 
         try:
-            # Connect to Neon
+            # Connect to Neon (read-only transaction; server-side cursors need one)
             conn = psycopg2.connect(self.neon_connection_string)
-            cursor = conn.cursor()
+            conn.set_session(readonly=True, autocommit=False)
+
+            # Named cursor = Postgres server-side cursor: rows are streamed in
+            # batches instead of psycopg2 buffering the whole result set in memory
+            cursor = conn.cursor(name="neon_products")
+            cursor.itersize = NEON_FETCH_BATCH_SIZE
 
             # Build query that merges store_view_code = null and 'mercedesscientific'
             # Prioritize NULL row for most data (has price, full descriptions, specs)
@@ -169,8 +251,10 @@ class NeonProductIndexer:
                 SELECT
                     sku,
                     COALESCE(name_null, name_mercedes) as name,
-                    description,
-                    short_description,
+                    -- Strip HTML tags, trim and cap at 500 chars server-side (NULL if empty),
+                    -- so only the text that gets indexed is sent over the wire
+                    NULLIF(LEFT(BTRIM(REGEXP_REPLACE(description, '<[^<]+?>', '', 'g'), E' \\t\\n\\r\\f'), 500), '') as description,
+                    NULLIF(LEFT(BTRIM(REGEXP_REPLACE(short_description, '<[^<]+?>', '', 'g'), E' \\t\\n\\r\\f'), 500), '') as short_description,
                     price,
                     special_price,
                     product_type,
@@ -198,35 +282,36 @@ class NeonProductIndexer:
                 print("Fetching all unique products")
             print(f"Note: This query may take 1-3 minutes depending on database size\n")
 
-            # Execute query with timing
-            import time
-            query_start = time.time()
-            print("⏳ Executing database query...")
+            # Declare the cursor; Postgres runs the query as rows are fetched,
+            # so the first batch includes the query time
             cursor.execute(query)
-            query_time = time.time() - query_start
-            print(f"✓ Query executed in {query_time:.1f}s\n")
 
             # Fetch rows in chunks with progress indicator
-            print("⏳ Fetching and transforming products...")
+            print("⏳ Executing query, fetching and transforming products...")
             fetch_start = time.time()
-            products = []
-            batch_size = 1000  # Fetch 1000 rows at a time
+            total_products = 0
             total_fetched = 0
+            # (sku, error) for rows that failed to transform, reported once after the fetch
+            transform_errors = []
 
             while True:
-                rows = cursor.fetchmany(batch_size)
+                rows = cursor.fetchmany(NEON_FETCH_BATCH_SIZE)
                 if not rows:
                     break
 
                 # Transform rows
                 for row in rows:
-                    product = self._transform_neon_product(row)
-                    if product:
-                        products.append(product)
+                    try:
+                        product = self._transform_neon_product(row)
+                    except (ValueError, TypeError, AttributeError) as e:
+                        transform_errors.append((row[0], str(e)))
+                        continue
+                    total_products += 1
+                    yield product
 
                 total_fetched += len(rows)
 
-                # Show progress every 1000 products
+                # Show progress every batch
                 elapsed = time.time() - fetch_start
                 rate = total_fetched / elapsed if elapsed > 0 else 0
                 print(f"  Fetched {total_fetched:,} rows ({rate:.0f} rows/sec)...")
@@ -238,19 +323,29 @@ class NeonProductIndexer:
             fetch_time = time.time() - fetch_start
             print(f"✓ Fetch completed in {fetch_time:.1f}s")
 
+            if transform_errors:
+                print(f"⚠ Skipped {len(transform_errors):,} products that failed to transform:")
+                for sku, error in transform_errors[:MAX_TRANSFORM_ERRORS_SHOWN]:
+                    print(f"  ⚠ {sku}: {error}")
+                if len(transform_errors) > MAX_TRANSFORM_ERRORS_SHOWN:
+                    print(f"  ... and {len(transform_errors) - MAX_TRANSFORM_ERRORS_SHOWN:,} more")
+
             cursor.close()
-            conn.close()
+            conn.commit()
 
             print(f"{'='*60}")
-            print(f"✓ Total unique products fetched: {len(products):,}")
+            print(f"✓ Total unique products fetched: {total_products:,}")
             print(f"{'='*60}")
 
-            return products
-
         except Exception as e:
             print(f"✗ Error fetching from Neon: {e}")
             raise
 
+        finally:
+            # Also runs if the consumer stops iterating early
+            if conn is not None:
+                conn.close()
+
     def _calculate_brand_priority(self, brand: str, product_name: str = None) -> int:
         """
         Calculate brand priority for sorting.
@@ -285,60 +380,6 @@ class NeonProductIndexer:
             # No brand
             return 0
 
-    def _clean_and_deduplicate_categories(self, raw_categories: List[str]) -> List[str]:
-        """
-        Clean and deduplicate category names.
-
-        Removes "Mercedes Scientific Main Store/" prefix and deduplicates categories
-        that have the same end path (e.g., multiple "Shop By Lab" variations).
-        Prefers shorter, more direct paths (Products over Shop By Lab).
-        """
-        if not raw_categories:
-            return []
-
-        # Step 1: Clean category names by removing prefix
-        cleaned = []
-        for cat in raw_categories:
-            # Remove the "Mercedes Scientific Main Store/" prefix
-            cleaned_cat = cat.replace("Mercedes Scientific Main Store/", "")
-            if cleaned_cat:
-                cleaned.append(cleaned_cat)
-
-        # Step 2: Deduplicate by end path
-        # Keep track of end paths we've seen (after last '/')
-        seen_end_paths = {}
-        unique_categories = []
-
-        for cat in cleaned:
-            # Extract the end path (e.g., "Specimen Collection/Cytology")
-            parts = cat.split('/')
-
-            # Consider the last 2 segments as the "end path" for deduplication
-            # This handles cases like "Products/Gloves" vs "Shop By Lab/Chemistry/Gloves"
-            if len(parts) >= 2:
-                end_path = '/'.join(parts[-2:])
-            else:
-                end_path = cat
-
-            # If we haven't seen this end path, or if this is a shorter path, keep it
-            if end_path not in seen_end_paths:
-                seen_end_paths[end_path] = cat
-                unique_categories.append(cat)
-            else:
-                # If this path is shorter, replace the existing one
-                existing = seen_end_paths[end_path]
-                if len(cat) < len(existing):
-                    # Remove the old one and add the new shorter one
-                    if existing in unique_categories:
-                        unique_categories.remove(existing)
-                    seen_end_paths[end_path] = cat
-                    unique_categories.append(cat)
-
-        # Step 3: Sort to have "Products" paths first, then others
-        unique_categories.sort(key=lambda x: (not x.startswith('Products/'), len(x), x))
-
-        return unique_categories
-
     def _normalize_sku(self, text: str) -> str:
         """
         Normalize SKU for exact matching.
@@ -369,9 +410,8 @@ class NeonProductIndexer:
             return ""
 
         # Step 1: Split camelCase (insert space before capital letters)
-        import re
         # Insert space before uppercase letters that follow lowercase letters
-        text = re.sub(r'([a-z])([A-Z])', r'\1 \2', text)
+        text = CAMEL_CASE_PATTERN.sub(r'\1 \2', text)
 
         # Step 2: Replace separators with spaces, then lowercase
         normalized = text.replace("-", " ").replace(".", " ").replace("/", " ").replace(",", " ").lower()
@@ -381,110 +421,172 @@ class NeonProductIndexer:
         return normalized
 
     def _transform_neon_product(self, row) -> Dict[str, Any]:
-        """Transform Neon database row to Typesense document."""
-        try:
-            sku, name, description, short_description, price, special_price, product_type, url_key, base_image, categories, additional_attributes, weight, qty, created_at, updated_at, is_in_stock = row
-
-            # Parse categories (comma-separated string to list)
-            raw_category_list = []
-            if categories:
-                raw_category_list = [cat.strip() for cat in categories.split(',') if cat.strip()]
-
-            # Clean and deduplicate categories
-            category_list = self._clean_and_deduplicate_categories(raw_category_list)
-
-            # Parse additional_attributes to extract product specs
-            specs = self._parse_additional_attributes(additional_attributes)
-
-            # Add important specs to categories for better searchability
-            if specs.get('brand'):
-                category_list.append(f"Brand: {specs['brand']}")
-            if specs.get('grade'):
-                category_list.append(f"Grade: {specs['grade']}")
-            if specs.get('size'):
-                category_list.append(f"Size: {specs['size']}")
-
-            # Enrich description with specs if available
-            description_clean = self._clean_html(description) if description else None
-            if description_clean and specs:
-                # Keep description as-is, specs are already in additional_attributes
-                pass
-            elif not description_clean and specs:
-                # If no description, create one from specs
-                spec_desc = []
-                for key in ['brand', 'grade', 'size', 'color', 'physical_form']:
-                    if specs.get(key):
-                        spec_desc.append(f"{key.replace('_', ' ').title()}: {specs[key]}")
-                if spec_desc:
-                    description_clean = "; ".join(spec_desc)
-
-            short_desc_clean = self._clean_html(short_description) if short_description else None
-
-            # Map stock status
-            stock_status = "IN_STOCK" if is_in_stock == '1' else "OUT_OF_STOCK"
-
-            # Build image URL
-            image_url = None
-            if base_image:
-                image_url = f"https://www.mercedesscientific.com/media/catalog/product{base_image}"
-
-            # Parse timestamps to Unix epoch (int64)
-            created_ts = None
-            updated_ts = None
-            if created_at:
-                try:
-                    from datetime import datetime
-                    # Format: "2025-01-15 10:30:45" or similar
-                    dt = datetime.fromisoformat(created_at.replace(' ', 'T'))
-                    created_ts = int(dt.timestamp())
-                except:
-                    pass
-
-            if updated_at:
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(updated_at.replace(' ', 'T'))
-                    updated_ts = int(dt.timestamp())
-                except:
-                    pass
-
-            # Calculate brand priority (check both brand field and product name)
-            brand_priority = self._calculate_brand_priority(specs.get('brand'), name)
-
-            return {
-                "product_id": sku,  # Use SKU as product_id
-                "sku": sku,
-                "sku_normalized": self._normalize_sku(sku),  # Remove ALL separators for exact matching
-                "name": name,
-                "name_normalized": self._normalize_name(name),  # Split camelCase + keep spaces for tokens
-                "url_key": url_key or "",
-                "stock_status": stock_status,
-                "product_type": product_type or "simple",
-                "description": description_clean,
-                "short_description": short_desc_clean,
-                "price": float(price) if price else None,
-                "special_price": float(special_price) if special_price else None,
-                "currency": "USD",
-                "image_url": image_url,
-                "categories": category_list,
-                # Product attributes from additional_attributes
-                "brand": specs.get('brand'),
-                "brand_priority": brand_priority,  # Priority for in-house brands
-                "size": specs.get('size'),
-                "color": specs.get('color'),
-                "physical_form": specs.get('physical_form'),
-                "cas_number": specs.get('cas_number'),
-                # Inventory and shipping
-                "qty": float(qty) if qty else None,
-                "weight": float(weight) if weight else None,
-                # Temporal fields
-                "created_at": created_ts,
-                "updated_at": updated_ts,
-            }
+        """
+        Transform Neon database row to Typesense document.
 
-        except Exception as e:
-            print(f"  ⚠ Error transforming product {row[0] if row else 'unknown'}: {e}")
+        Raises:
+            ValueError, TypeError, AttributeError: If the row has malformed values
+        """
+        sku, name, description, short_description, price, special_price, product_type, url_key, base_image, categories, additional_attributes, weight, qty, created_at, updated_at, is_in_stock = row
+
+        # Parse categories (comma-separated string to list)
+        raw_category_list = []
+        if categories:
+            raw_category_list = [cat.strip() for cat in categories.split(',') if cat.strip()]
+
+        # Clean and deduplicate categories
+        category_list = clean_and_deduplicate_categories(raw_category_list)
+
+        # Parse additional_attributes to extract product specs
+        specs = self._parse_additional_attributes(additional_attributes)
+
+        brand = specs.get('brand')
+        grade = specs.get('grade')
+        size = specs.get('size')
+
+        # Add important specs to categories for better searchability
+        if brand:
+            category_list.append(f"Brand: {brand}")
+        if grade:
+            category_list.append(f"Grade: {grade}")
+        if size:
+            category_list.append(f"Size: {size}")
+
+        # Enrich description with specs if available
+        # (descriptions arrive HTML-stripped and truncated from the query)
+        description_clean = description
+        if description_clean and specs:
+            # Keep description as-is, specs are already in additional_attributes
+            pass
+        elif not description_clean and specs:
+            # If no description, create one from specs
+            spec_desc = []
+            for key in ['brand', 'grade', 'size', 'color', 'physical_form']:
+                if specs.get(key):
+                    spec_desc.append(f"{key.replace('_', ' ').title()}: {specs[key]}")
+            if spec_desc:
+                description_clean = "; ".join(spec_desc)
+
+        short_desc_clean = short_description
+
+        # Map stock status
+        stock_status = "IN_STOCK" if is_in_stock == '1' else "OUT_OF_STOCK"
+
+        # Build image URL
+        image_url = None
+        if base_image:
+            image_url = f"https://www.mercedesscientific.com/media/catalog/product{base_image}"
+
+        # Parse timestamps to Unix epoch (int64)
+        created_ts = self._parse_timestamp(created_at)
+        updated_ts = self._parse_timestamp(updated_at)
+
+        # Calculate brand priority (check both brand field and product name)
+        brand_priority = self._calculate_brand_priority(brand, name)
+
+        document = {
+            "id": sku,  # Stable document ID, so re-imports replace instead of duplicating
+            "product_id": sku,  # Use SKU as product_id
+            "sku": sku,
+            "sku_normalized": self._normalize_sku(sku),  # Remove ALL separators for exact matching
+            "name": name,
+            "name_normalized": self._normalize_name(name),  # Split camelCase + keep spaces for tokens
+            "url_key": url_key or "",
+            "stock_status": stock_status,
+            "product_type": product_type or "simple",
+            "description": description_clean,
+            "short_description": short_desc_clean,
+            "price": float(price) if price else None,
+            "special_price": float(special_price) if special_price else None,
+            "currency": "USD",
+            "image_url": image_url,
+            "categories": category_list,
+            # Product attributes from additional_attributes
+            "brand": brand,
+            "brand_priority": brand_priority,  # Priority for in-house brands
+            "size": size,
+            "color": specs.get('color'),
+            "physical_form": specs.get('physical_form'),
+            "cas_number": specs.get('cas_number'),
+            # Inventory and shipping
+            "qty": float(qty) if qty else None,
+            "weight": float(weight) if weight else None,
+            # Temporal fields
+            "created_at": created_ts,
+            "updated_at": updated_ts,
+        }
+        document["content_hash"] = self._content_hash(document)
+        return document
+
+    def _parse_timestamp(self, value: str) -> int:
+        """
+        Parse a catalog timestamp (e.g. "2025-01-15 10:30:45") to Unix epoch.
+
+        Returns:
+            Epoch seconds, or None if missing or unparseable
+        """
+        if not value:
             return None
+        try:
+            # fromisoformat is C-implemented and accepts a space as the separator
+            return int(datetime.fromisoformat(value).timestamp())
+        except (TypeError, ValueError):
+            return None
+
+    def _content_hash(self, document: Dict[str, Any]) -> str:
+        """
+        Hash every field of a document (before content_hash is added).
+
+        Covers more than the embedding source fields, so price/stock changes
+        are still re-imported; Typesense only re-embeds when those fields change.
+        Keys are sorted and None fields left out, so the hash doesn't depend on
+        field order or on optional fields that have no value.
+        """
+        present = {key: value for key, value in document.items() if value is not None}
+        serialized = orjson.dumps(present, option=orjson.OPT_SORT_KEYS)
+        return hashlib.md5(serialized).hexdigest()
+
+    def _load_content_hashes(self) -> Dict[str, str]:
+        """
+        Load the content hash of every document already in the collection.
+
+        The JSONL export is streamed line by line, so only the id → hash pairs
+        are held in memory rather than the whole export.
+
+        Returns:
+            Dict mapping document ID (SKU) to content hash
+
+        Raises:
+            ValueError: If the collection was built before content hashes
+        """
+        print(f"\nLoading content hashes of indexed products...")
+        response = self.session.get(
+            self.export_url,
+            params={"include_fields": "id,content_hash"},
+            headers={"X-TYPESENSE-API-KEY": Config.TYPESENSE_API_KEY},
+            timeout=IMPORT_TIMEOUT_SECONDS,
+            stream=True
+        )
+        response.raise_for_status()
+
+        hashes = {}
+        for line in response.iter_lines():
+            if not line:
+                continue
+            doc = orjson.loads(line)
+            if "content_hash" not in doc:
+                # Indexed before content hashes (random IDs): emplace can't match
+                # those documents by SKU, so importing would list every product twice
+                response.close()
+                raise ValueError(
+                    f"Collection '{self.collection_name}' was built by the old indexer "
+                    f"(documents without content_hash). Re-run and answer 'y' to delete "
+                    f"and recreate it once; incremental re-indexing works after that"
+                )
+            hashes[doc["id"]] = doc["content_hash"]
+
+        print(f"✓ Loaded {len(hashes):,} content hashes")
+        return hashes
 
     def _parse_additional_attributes(self, attrs_string: str) -> Dict[str, str]:
         """Parse additional_attributes string to extract product specs."""
@@ -495,24 +597,24 @@ class NeonProductIndexer:
 
         try:
             # Format: key1=value1,key2=value2,key3={...}
-            # Split by comma but respect nested braces
+            # Split by comma but respect nested braces. The regex jumps straight
+            # to the next brace or comma, so only those characters are visited
+            # in Python and each pair is sliced out in one go.
             pairs = []
-            current = []
+            start = 0
             brace_depth = 0
 
-            for char in attrs_string:
+            for match in ATTRIBUTE_DELIMITER_PATTERN.finditer(attrs_string):
+                char = match.group()
                 if char == '{':
                     brace_depth += 1
                 elif char == '}':
                     brace_depth -= 1
-                elif char == ',' and brace_depth == 0:
-                    pairs.append(''.join(current))
-                    current = []
-                    continue
-                current.append(char)
+                elif brace_depth == 0:
+                    pairs.append(attrs_string[start:match.start()])
+                    start = match.end()
 
-            if current:
-                pairs.append(''.join(current))
+            pairs.append(attrs_string[start:])
 
             # Parse each key=value pair
             for pair in pairs:
@@ -524,7 +626,7 @@ class NeonProductIndexer:
                 value = value.strip()
 
                 # Extract important specs
-                if key in ['brand', 'grade', 'size', 'color', 'physical_form', 'cas_number', 'type_attribute']:
+                if key in WANTED_ATTRIBUTES:
                     # Clean value (remove quotes, braces for simple values)
                     if value.startswith('{') or value.startswith('['):
                         continue  # Skip complex nested values
@@ -537,20 +639,16 @@ class NeonProductIndexer:
 
         return specs
 
-    def _clean_html(self, html: str) -> str:
-        """Remove HTML tags from string."""
-        import re
-        if not html:
-            return ""
-        clean = re.sub('<[^<]+?>', '', html)
-        clean = clean.strip()
-        return clean[:500] if len(clean) > 500 else clean  # Limit length
+    def _check_nl_model(self) -> bool:
+        """
+        Check if natural language search model is configured.
 
-    def _check_nl_model(self):
-        """Check if natural language search model is configured."""
-        import requests
+        Only makes the request (no output), so it can run in the background;
+        see _report_nl_model.
 
-        model_id = "openai-gpt4o-mini"
+        Returns:
+            True if the model exists in Typesense
+        """
         base_url = f"{Config.TYPESENSE_PROTOCOL}://{Config.TYPESENSE_HOST}:{Config.TYPESENSE_PORT}"
 
         headers = {
@@ -559,81 +657,129 @@ class NeonProductIndexer:
         }
 
         try:
-            check_url = f"{base_url}/nl_search_models/{model_id}"
-            response = requests.get(check_url, headers=headers, timeout=5)
-
-            if response.status_code == 200:
-                print(f"\n✓ Natural Language Search model '{model_id}' is configured")
-            else:
-                print(f"\n⚠ WARNING: Natural Language Search model not configured!")
-                print(f"   Model '{model_id}' does not exist in Typesense.")
-                print(f"   Your search will work, but NL features (filter extraction, etc.) will be limited.")
-                print(f"   Run: python src/setup_nl_model.py")
+            check_url = f"{base_url}/nl_search_models/{NL_MODEL_ID}"
+            response = self.session.get(check_url, headers=headers, timeout=NL_MODEL_CHECK_TIMEOUT)
+            return response.status_code == 200
         except Exception:
+            return False
+
+    def _report_nl_model(self, configured: bool):
+        """Print the result of _check_nl_model."""
+        if configured:
+            print(f"\n✓ Natural Language Search model '{NL_MODEL_ID}' is configured")
+        else:
             print(f"\n⚠ WARNING: Natural Language Search model not configured!")
-            print(f"   Model '{model_id}' does not exist in Typesense.")
+            print(f"   Model '{NL_MODEL_ID}' does not exist in Typesense.")
             print(f"   Your search will work, but NL features (filter extraction, etc.) will be limited.")
             print(f"   Run: python src/setup_nl_model.py")
         print()
 
-    def index_products(self, products: List[Dict[str, Any]], batch_size: int = 100):
-        """Index products to Typesense with auto-embeddings."""
-        total_batches = (len(products) + batch_size - 1) // batch_size
-        print(f"\nIndexing {len(products):,} products to Typesense...")
-        print(f"Batches: {total_batches} (batch size: {batch_size})")
+    def index_products(
+        self,
+        products: Iterable[Dict[str, Any]],
+        batch_size: int = IMPORT_BATCH_SIZE,
+        max_workers: int = Config.TYPESENSE_IMPORT_WORKERS,
+        existing_hashes: Dict[str, str] = None
+    ) -> int:
+        """
+        Index products to Typesense with auto-embeddings.
+
+        Products may be a list or a stream (see iter_products_from_neon). Batches
+        are imported as soon as they are filled, with at most 2 × max_workers
+        batches pending, so fetching and importing overlap without buffering
+        the whole catalog.
+
+        Args:
+            products: Transformed products to import
+            batch_size: Documents per import request
+            max_workers: Import requests in flight at the same time
+            existing_hashes: Content hashes already in the collection (see
+                _load_content_hashes); products with an unchanged hash are skipped
+
+        Returns:
+            Number of successfully indexed products
+        """
+        total_products = len(products) if isinstance(products, list) else None
+        print(f"\nIndexing products to Typesense...")
+        print(f"Batch size: {batch_size} ({max_workers} batches in parallel)")
         print(f"Note: Embeddings are generated automatically during indexing\n")
 
-        total_indexed = 0
-        failed_count = 0
+        counts = {"indexed": 0, "failed": 0, "unchanged": 0}
+        last_progress = {"time": time.time()}
+
+        if existing_hashes:
+            def is_changed(product: Dict[str, Any]) -> bool:
+                if existing_hashes.get(product["id"]) == product["content_hash"]:
+                    counts["unchanged"] += 1
+                    return False
+                return True
 
-        for i in range(0, len(products), batch_size):
-            batch = products[i:i + batch_size]
-            batch_num = i // batch_size + 1
+            products = filter(is_changed, products)
 
+        def record_batch(future, batch_num: int, batch_len: int):
             try:
-                # Import documents (embeddings generated automatically by Typesense)
-                result = self.typesense_client.collections[self.collection_name].documents.import_(
-                    batch,
-                    {"action": "create"}
-                )
+                success_count, batch_failed = future.result()
+
+                counts["indexed"] += success_count
+                counts["failed"] += batch_failed
+
+                # Progress indicator, throttled so large runs don't flood stdout
+                now = time.time()
+                if not batch_failed and now - last_progress["time"] < PROGRESS_INTERVAL_SECONDS:
+                    return
+                last_progress["time"] = now
 
-                # Count successful imports
-                success_count = 0
-                batch_failed = 0
-
-                for item in result:
-                    # Handle both string and dict responses
-                    if isinstance(item, str):
-                        parsed = json.loads(item)
-                    else:
-                        parsed = item
-
-                    if parsed.get("success"):
-                        success_count += 1
-                    else:
-                        batch_failed += 1
-                        # Print errors for debugging
-                        if "error" in parsed:
-                            print(f"    ⚠ Error in batch {batch_num}: {parsed.get('error')}")
-
-                total_indexed += success_count
-                failed_count += batch_failed
-
-                # Progress indicator
-                progress = (total_indexed / len(products)) * 100
-                print(f"  Batch {batch_num}/{total_batches}: Indexed {success_count}/{len(batch)} products "
-                      f"(Total: {total_indexed:,}/{len(products):,} | {progress:.1f}% complete)")
+                if total_products:
+                    progress = (counts["indexed"] / total_products) * 100
+                    print(f"  Batch {batch_num}: Indexed {success_count}/{batch_len} products "
+                          f"(Total: {counts['indexed']:,}/{total_products:,} | {progress:.1f}% complete)")
+                else:
+                    print(f"  Batch {batch_num}: Indexed {success_count}/{batch_len} products "
+                          f"(Total: {counts['indexed']:,})")
 
             except Exception as e:
                 print(f"✗ Error indexing batch {batch_num}: {e}")
-                failed_count += len(batch)
+                counts["failed"] += batch_len
+
+        # Batches are imported in parallel; each one waits on Typesense generating
+        # embeddings through OpenAI, so the work is network-bound
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            product_iter = iter(products)
+            batch_num = 0
+
+            while True:
+                batch = list(itertools.islice(product_iter, batch_size))
+                if not batch:
+                    break
+
+                batch_num += 1
+                pending[executor.submit(self._import_batch, batch, batch_num)] = (batch_num, len(batch))
+
+                # Don't let the producer run far ahead of the imports
+                if len(pending) >= max_workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record_batch(future, *pending.pop(future))
+
+            for future in as_completed(pending):
+                record_batch(future, *pending[future])
 
         print(f"\n{'='*60}")
-        print(f"✓ Successfully indexed: {total_indexed:,} products")
-        if failed_count > 0:
-            print(f"⚠ Failed to index: {failed_count} products")
+        print(f"✓ Successfully indexed: {counts['indexed']:,} products")
+        if counts["unchanged"] > 0:
+            print(f"✓ Skipped unchanged: {counts['unchanged']:,} products")
+        if counts["failed"] > 0:
+            print(f"⚠ Failed to index: {counts['failed']} products")
         print(f"{'='*60}")
 
+        return counts["indexed"]
+
+    def _import_batch(self, batch: List[Dict[str, Any]], batch_num: int) -> tuple:
+        """Import a batch of documents (see indexing.import_batch)."""
+        # emplace creates new products and updates changed ones in place
+        return import_batch(self.session, self.import_url, batch, batch_num, action="emplace")
+
     def run(self, max_products: int = None):
         """Run the complete indexing process."""
         print("=" * 60)
@@ -650,30 +796,40 @@ class NeonProductIndexer:
         print(f"Collection: {self.collection_name}")
         print("=" * 60)
 
-        # Check if NL search model is configured
-        self._check_nl_model()
-
         try:
-            # Create collection
-            self.create_collection()
+            # Check if NL search model is configured, in the background while the
+            # collection is set up (the result is printed before indexing starts)
+            with ThreadPoolExecutor(max_workers=1) as preflight:
+                nl_model_check = preflight.submit(self._check_nl_model)
 
-            # Fetch products from Neon
-            products = self.fetch_products_from_neon(limit=max_products)
+                # Create collection; when the existing one is kept, only products
+                # whose content hash changed are re-imported (and re-embedded)
+                created = self.create_collection()
+                existing_hashes = {} if created else self._load_content_hashes()
 
-            if not products:
-                print("✗ No products to index")
-                return
+                self._report_nl_model(nl_model_check.result())
 
-            # Index products (with embeddings)
+            # Stream products from Neon straight into the import (with embeddings),
+            # so batches upload while later rows are still being fetched
             print(f"\n{'='*60}")
             print(f"Starting indexing with auto-embeddings...")
             print(f"This may take 20-40 minutes for full catalog (34k+ products)")
             print(f"{'='*60}")
-            self.index_products(products)
+            total_indexed = self.index_products(
+                self.iter_products_from_neon(limit=max_products),
+                existing_hashes=existing_hashes
+            )
+
+            if not total_indexed:
+                if existing_hashes:
+                    print("✓ No new or changed products to index")
+                else:
+                    print("✗ No products indexed")
+                return
 
             print("\n" + "=" * 60)
             print("✓ Indexing completed successfully!")
-            print(f"✓ Total products indexed: {len(products):,}")
+            print(f"✓ Total products indexed: {total_indexed:,}")
             print(f"✓ Semantic search is now enabled!")
             print("=" * 60)
 
@@ -683,7 +839,6 @@ class NeonProductIndexer:
 
 
 if __name__ == "__main__":
-    import time
     start_time = time.time()
 
     indexer = NeonProductIndexer()
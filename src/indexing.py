@@ -0,0 +1,120 @@
+"""Helpers shared by the GraphQL (indexer.py) and Neon (indexer_neon.py) indexers."""
+import gzip
+import orjson
+import requests
+from typing import List, Dict, Any, Tuple
+from config import Config
+
+# Import requests wait on Typesense generating embeddings for the whole batch
+IMPORT_TIMEOUT_SECONDS = 300
+
+# Documents Typesense processes together inside one import request (server default is 40)
+IMPORT_SERVER_BATCH_SIZE = 200
+
+# Root of every category path in the catalog
+CATEGORY_ROOT_PREFIX = "Mercedes Scientific Main Store/"
+
+
+def clean_and_deduplicate_categories(raw_categories: List[str]) -> List[str]:
+    """
+    Clean and deduplicate category names.
+
+    Removes "Mercedes Scientific Main Store/" prefix and deduplicates categories
+    that have the same end path (e.g., multiple "Shop By Lab" variations).
+    Prefers shorter, more direct paths (Products over Shop By Lab).
+    """
+    if not raw_categories:
+        return []
+
+    # Step 1: Clean category names by removing the store root prefix
+    cleaned = []
+    for cat in raw_categories:
+        cleaned_cat = cat.removeprefix(CATEGORY_ROOT_PREFIX) if cat else ""
+        if cleaned_cat:
+            cleaned.append(cleaned_cat)
+
+    # Step 2: Deduplicate by end path, keeping the shortest path for each
+    shortest_by_end_path = {}
+
+    for cat in cleaned:
+        # Consider the last 2 segments as the "end path" for deduplication
+        # This handles cases like "Products/Gloves" vs "Shop By Lab/Chemistry/Gloves"
+        parts = cat.rsplit('/', 2)
+        end_path = '/'.join(parts[-2:]) if len(parts) >= 2 else cat
+
+        existing = shortest_by_end_path.get(end_path)
+        if existing is None or len(cat) < len(existing):
+            shortest_by_end_path[end_path] = cat
+
+    # Step 3: Sort to have "Products" paths first, then others
+    return sorted(
+        shortest_by_end_path.values(),
+        key=lambda x: (not x.startswith('Products/'), len(x), x)
+    )
+
+
+def import_batch(
+    session: requests.Session,
+    import_url: str,
+    batch: List[Dict[str, Any]],
+    batch_num: int,
+    action: str
+) -> Tuple[int, int]:
+    """
+    Import one batch of documents through the JSONL import endpoint.
+
+    Each document is serialized once with orjson (gzipped when
+    TYPESENSE_IMPORT_GZIP is set) and the per-document results are read
+    line by line from the streamed response.
+
+    Args:
+        session: Keep-alive session for the import requests
+        import_url: Collection's documents/import URL
+        batch: Documents to import
+        batch_num: Batch number (for error messages)
+        action: Import action ("create", "upsert", "emplace", ...)
+
+    Returns:
+        Tuple of (successful imports, failed imports)
+    """
+    body = b"\n".join(orjson.dumps(doc) for doc in batch)
+    headers = {
+        "X-TYPESENSE-API-KEY": Config.TYPESENSE_API_KEY,
+        "Content-Type": "text/plain"
+    }
+
+    if Config.TYPESENSE_IMPORT_GZIP:
+        # Repeated field names and category paths compress well; level 1 keeps it cheap
+        body = gzip.compress(body, compresslevel=1)
+        headers["Content-Encoding"] = "gzip"
+
+    # Embeddings are generated by Typesense during the import
+    response = session.post(
+        import_url,
+        params={"action": action, "batch_size": IMPORT_SERVER_BATCH_SIZE},
+        data=body,
+        headers=headers,
+        timeout=IMPORT_TIMEOUT_SECONDS,
+        stream=True
+    )
+    response.raise_for_status()
+
+    # Count successful imports
+    success_count = 0
+    batch_failed = 0
+
+    for line in response.iter_lines():
+        if not line:
+            continue
+
+        parsed = orjson.loads(line)
+
+        if parsed.get("success"):
+            success_count += 1
+        else:
+            batch_failed += 1
+            # Print errors for debugging
+            if "error" in parsed:
+                print(f"    ⚠ Error in batch {batch_num}: {parsed.get('error')}")
+
+    return success_count, batch_failed
@@ -1,20 +1,31 @@
 """Natural language search using Typesense native NL search."""
+import re
 import time
 import typesense
 from typing import Dict, Any, List
 from src.config import Config
 from src.models import SearchResponse, Product
+from src.search_params import QUERY_BY, QUERY_BY_WEIGHTS, extract_limit_from_query
 
 # Validate configuration
 Config.validate()
 
+# Default sort, overridden if the NL query extracts a sort
+DEFAULT_SORT_BY = "_text_match:desc,price:asc"
+
+# Category value in a filter: "categories:=Value" or "categories:=[Value, ...]",
+# stopping at && ) or ] to avoid capturing other filters
+CATEGORY_FILTER_PATTERN = re.compile(r'categories:=\[?([^\],\)&]+)')
+
 
 class NaturalLanguageSearch:
     """Natural language search engine using Typesense native NL search."""
 
     def __init__(self):
         """Initialize search engine."""
-        self.typesense_client = typesense.Client(Config.get_typesense_config())
+        self.typesense_client = typesense.Client(
+            Config.get_typesense_config(Config.TYPESENSE_SEARCH_TIMEOUT_SECONDS)
+        )
         self.collection_name = Config.TYPESENSE_COLLECTION_NAME
         # Use the registered NL model ID
         self.nl_model_id = "openai-gpt4o-mini"
@@ -36,7 +47,7 @@ class NaturalLanguageSearch:
         start_time = time.time()
 
         # Check if query contains explicit limit (e.g., "5 most expensive", "top 10")
-        extracted_limit = self._extract_limit_from_query(query)
+        extracted_limit = extract_limit_from_query(query)
         if extracted_limit:
             max_results = extracted_limit
 
@@ -106,43 +117,6 @@ class NaturalLanguageSearch:
             typesense_query=typesense_query
         )
 
-    def _extract_limit_from_query(self, query: str) -> int:
-        """
-        Extract result limit from query if explicitly mentioned.
-
-        Examples:
-        - "5 most expensive" → 5
-        - "top 10 reagents" → 10
-        - "first 3 gloves" → 3
-
-        Args:
-            query: Natural language query
-
-        Returns:
-            Extracted limit or None if not found
-        """
-        import re
-
-        # Pattern: number followed by superlatives/keywords
-        patterns = [
-            r'^(\d+)\s+(?:most|least|top|best|worst|cheapest|expensive)',  # "5 most expensive"
-            r'top\s+(\d+)',  # "top 10"
-            r'first\s+(\d+)',  # "first 3"
-            r'^(\d+)\s+\w+',  # "5 gloves" (number at start)
-        ]
-
-        query_lower = query.lower().strip()
-
-        for pattern in patterns:
-            match = re.search(pattern, query_lower)
-            if match:
-                limit = int(match.group(1))
-                # Sanity check: limit between 1 and 100
-                if 1 <= limit <= 100:
-                    return limit
-
-        return None
-
     def _execute_nl_search(self, query: str, max_results: int, debug: bool = False) -> Dict[str, Any]:
         """
         Execute natural language search using Typesense native NL search.
@@ -157,12 +131,12 @@ class NaturalLanguageSearch:
         """
         search_params = {
             "q": query,
-            "query_by": "name,sku,name_normalized,sku_normalized,description,short_description,categories",
-            "query_by_weights": "100,100,4,4,3,3,1",  # Extreme priority to original fields, normalized only assist when original fails
+            "query_by": QUERY_BY,
+            "query_by_weights": QUERY_BY_WEIGHTS,
             "nl_query": "true",  # Enable native NL search
             "nl_model_id": self.nl_model_id,
             "per_page": max_results,  # Default, will be overridden if NL query extracts a limit
-            "sort_by": "_text_match:desc,price:asc",  # Default sort, will be overridden if NL query extracts sort
+            "sort_by": DEFAULT_SORT_BY,
         }
 
         # Note: vector_query interferes with NL search's filter extraction
@@ -210,8 +184,8 @@ class NaturalLanguageSearch:
             try:
                 fallback_params = {
                     "q": query,
-                    "query_by": "name,sku,name_normalized,sku_normalized,description,short_description,categories",
-                    "query_by_weights": "100,100,4,4,3,3,1",
+                    "query_by": QUERY_BY,
+                    "query_by_weights": QUERY_BY_WEIGHTS,
                     "per_page": max_results,
                 }
                 results = self.typesense_client.collections[self.collection_name].documents.search(
@@ -277,11 +251,7 @@ class NaturalLanguageSearch:
         Returns:
             Category name (e.g., "Gloves")
         """
-        import re
-
-        # Match patterns like "categories:=Value" or "categories:=[Value, ...]"
-        # Stop at && or ) or ] to avoid capturing other filters
-        match = re.search(r'categories:=\[?([^\],\)&]+)', filter_by)
+        match = CATEGORY_FILTER_PATTERN.search(filter_by)
         if match:
             category = match.group(1).strip()
             # Remove trailing whitespace and special characters
@@ -375,8 +345,8 @@ class NaturalLanguageSearch:
         try:
             search_params = {
                 "q": query,
-                "query_by": "name,sku,name_normalized,sku_normalized,description,short_description,categories",
-                "query_by_weights": "100,100,4,4,3,3,1",
+                "query_by": QUERY_BY,
+                "query_by_weights": QUERY_BY_WEIGHTS,
                 "per_page": max_results,
             }
 
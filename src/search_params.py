@@ -0,0 +1,44 @@
+"""Typesense query settings shared by both search engines (search.py and search_rag.py)."""
+import re
+from typing import Optional
+
+# Fields searched by every query; original fields get extreme priority,
+# normalized fields only assist when the original fails
+QUERY_BY = "name,sku,name_normalized,sku_normalized,description,short_description,categories"
+QUERY_BY_WEIGHTS = "100,100,4,4,3,3,1"
+
+# Explicit result limits in a query ("5 most expensive", "top 10", "first 3", "5 gloves")
+LIMIT_PATTERNS = [
+    re.compile(r'^(\d+)\s+(?:most|least|top|best|worst|cheapest|expensive)'),
+    re.compile(r'top\s+(\d+)'),
+    re.compile(r'first\s+(\d+)'),
+    re.compile(r'^(\d+)\s+\w+'),
+]
+
+
+def extract_limit_from_query(query: str) -> Optional[int]:
+    """
+    Extract result limit from query if explicitly mentioned.
+
+    Examples:
+    - "5 most expensive" → 5
+    - "top 10 reagents" → 10
+    - "first 3 gloves" → 3
+
+    Args:
+        query: Natural language query
+
+    Returns:
+        Extracted limit or None if not found
+    """
+    query_lower = query.lower().strip()
+
+    for pattern in LIMIT_PATTERNS:
+        match = pattern.search(query_lower)
+        if match:
+            limit = int(match.group(1))
+            # Sanity check: limit between 1 and 100
+            if 1 <= limit <= 100:
+                return limit
+
+    return None
@@ -25,16 +25,129 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 import time
+import heapq
 import json
+import httpx
+import logging
+import orjson
+import requests
 import typesense
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from string import Template
 from typing import Dict, Any, List, Optional, Tuple
 from collections import defaultdict
+from pydantic import TypeAdapter, ValidationError
 from src.config import Config
 from src.models import SearchResponse, Product
+from src.cache import LRUCache, SemanticCache, normalize_query
+from src.circuit_breaker import CircuitBreaker
+from src.search_params import QUERY_BY, QUERY_BY_WEIGHTS, extract_limit_from_query
 from openai import OpenAI
 
-# Validate configuration
-Config.validate()
+logger = logging.getLogger(__name__)
+
+# Default ordering: in-house brands first, then relevance, then price
+DEFAULT_SORT_BY = "brand_priority:desc,_text_match:desc,price:asc"
+
+# Registered NL search model (string ID, works across Typesense instances)
+NL_MODEL_ID = "openai-gpt4o-mini"
+
+# Constant parts of the Typesense search params; per-request fields are merged in
+TEXT_SEARCH_PARAMS = {
+    "query_by": QUERY_BY,
+    "query_by_weights": QUERY_BY_WEIGHTS,
+    "exclude_fields": "embedding",  # Never used in results, large float arrays
+}
+NL_SEARCH_PARAMS = {
+    **TEXT_SEARCH_PARAMS,
+    "nl_query": "true",  # LLM Call 1: Extract filters, sorts, etc.
+    "nl_model_id": NL_MODEL_ID,
+    "sort_by": DEFAULT_SORT_BY,  # In-house brands first
+}
+
+# Validates a list of Typesense documents into Products in a single call
+PRODUCT_LIST_ADAPTER = TypeAdapter(List[Product])
+
+# Typesense errors that indicate an outage (counted by the circuit breaker)
+TYPESENSE_OUTAGE_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    typesense.exceptions.ServerError,
+    typesense.exceptions.ServiceUnavailable,
+)
+
+# Bump when editing the classification prompts so cached classifications are not reused
+CLASSIFICATION_PROMPT_VERSION = 2
+
+# System message for the RAG classification call (LLM Call 2)
+CLASSIFICATION_SYSTEM_PROMPT = (
+    "You are a product categorization expert. Analyze search queries and product "
+    "context to determine the most relevant category."
+)
+
+# Classification prompt, built once; only the query and category context vary
+CLASSIFICATION_PROMPT_TEMPLATE = Template("""Given the user search query and the top product categories with sample products, determine the most relevant category.
+
+**User Query**: "$query"
+
+**Top Categories with Sample Products**:
+$context_str
+
+**Task**:
+1. Analyze the query intent
+2. Consider the sample products in each category
+3. Determine which category best matches the query
+4. Assign a confidence score (0.0 to 1.0)
+
+**Decision Criteria**:
+- **Exact match** (SKU or exact product name): Very high confidence (0.9-1.0)
+- **Clear product type** (e.g., "nitrile gloves" → Gloves): High confidence (0.7-0.9)
+- **Product type + attributes** (e.g., "blue nitrile gloves"): High confidence (0.7-0.9)
+- **Brand + product type** (e.g., "Thermo Fisher pipettes"): Medium-high confidence (0.6-0.8)
+- **Ambiguous or attribute-only**: Low confidence (0.0-0.5) → Return null
+
+**CRITICAL RULES - Return null for category and confidence < 0.5 if**:
+1. **Single attribute word without product type**:
+   - Examples: "clear", "large", "medium", "blue", "sterile", "disposable"
+   - These are attributes (color, size, property), NOT product types
+   - Rule: If query is 1-2 words AND doesn't mention a specific product type, return null
+
+2. **Brand name only without product type**:
+   - Examples: "Mercedes Scientific", "Ansell", "Yamato", "Thermo Fisher"
+   - Brands span many categories, too ambiguous to filter
+   - Rule: If query is only a brand name, return null
+
+3. **Generic attribute categories**:
+   - Avoid categories like "Brand: X", "Size: X", "Color: X"
+   - These are not product categories, they're attributes
+   - Rule: If category name starts with "Brand:", "Size:", "Color:", return null
+
+4. **Highly ambiguous product types**:
+   - Examples: "filters" (could be water, air, syringe, etc.)
+   - Multiple distinct product categories match equally well
+   - Rule: If 3+ categories match equally, return null
+
+**Important**:
+- Be CONSERVATIVE - when in doubt, return null with low confidence
+- Only return a category if you're confident (>= 0.7) it's the right one
+- A null response is better than a wrong category filter
+- If you see an exact SKU or product name match, prioritize that category
+
+**Response Format** (JSON):
+{
+  "category": "CategoryName" or null,
+  "confidence": 0.85,
+  "reasoning": "Explanation of why this category was chosen (or why null was returned)"
+}
+
+**Examples**:
+
+Query: "clear" → {"category": null, "confidence": 0.2, "reasoning": "Single attribute word without product type"}
+Query: "Mercedes Scientific" → {"category": null, "confidence": 0.3, "reasoning": "Brand only, spans many categories"}
+Query: "nitrile gloves" → {"category": "Products/Gloves & Apparel/Gloves", "confidence": 0.85, "reasoning": "Clear product type match"}
+Query: "Ansell gloves ANS 5789911" → {"category": "Products/Gloves & Apparel/Gloves", "confidence": 0.95, "reasoning": "Exact SKU match"}
+""")
 
 
 class RAGCategoryClassification:
@@ -60,12 +173,121 @@ class RAGNaturalLanguageSearch:
 
     def __init__(self):
         """Initialize search engine."""
-        self.typesense_client = typesense.Client(Config.get_typesense_config())
+        # Validate configuration
+        Config.validate()
+
+        self.typesense_client = typesense.Client(
+            Config.get_typesense_config(Config.TYPESENSE_SEARCH_TIMEOUT_SECONDS)
+        )
+        self._configure_typesense_pool()
+        self.typesense_breaker = CircuitBreaker(
+            "Typesense",
+            window=Config.TYPESENSE_BREAKER_WINDOW,
+            failure_ratio=Config.TYPESENSE_BREAKER_FAILURE_RATIO,
+            cooldown_seconds=Config.TYPESENSE_BREAKER_COOLDOWN_SECONDS
+        )
         self.collection_name = Config.TYPESENSE_COLLECTION_NAME
-        self.openai_client = OpenAI(api_key=Config.OPENAI_API_KEY)
+        # Resolve the collection's documents endpoint once, not per search
+        self.documents = self.typesense_client.collections[self.collection_name].documents
+        # Shared keep-alive pool so repeated LLM calls skip the TLS handshake
+        self.openai_client = OpenAI(
+            api_key=Config.OPENAI_API_KEY,
+            http_client=httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=Config.HTTP_POOL_SIZE * 2,
+                    max_keepalive_connections=Config.HTTP_POOL_SIZE
+                )
+            )
+        )
         # Use the RAG-optimized NL model
-        # Use string ID which should work across different Typesense instances
-        self.nl_model_id = "openai-gpt4o-mini"
+        self.nl_model_id = NL_MODEL_ID
+        # LLM classifications, reused across max_results/limit variants of a query
+        self.classification_cache = LRUCache(
+            max_entries=Config.CLASSIFICATION_CACHE_SIZE,
+            ttl_seconds=Config.SEARCH_CACHE_TTL_SECONDS
+        )
+        # Query embeddings, shared by the retrieval cache and the API response cache
+        self.embedding_cache = LRUCache(
+            max_entries=Config.SEARCH_CACHE_SIZE,
+            ttl_seconds=Config.SEARCH_CACHE_TTL_SECONDS
+        )
+        # Step 1 NL retrievals (LLM Call 1), reused for repeated and paraphrased queries
+        self.retrieval_cache = SemanticCache(
+            embed_fn=self.embed_query,
+            similarity_threshold=Config.SEARCH_CACHE_SIMILARITY,
+            max_entries=Config.SEARCH_CACHE_SIZE,
+            ttl_seconds=Config.SEARCH_CACHE_TTL_SECONDS
+        )
+
+    def _configure_typesense_pool(self):
+        """
+        Mount a larger keep-alive connection pool on the Typesense HTTP session.
+
+        The typesense client sends every request through one shared requests
+        session, but the default adapter only keeps 10 connections alive, so
+        concurrent searches beyond that re-open TCP + TLS connections.
+
+        Failed connects and gateway errors are retried with a short backoff;
+        read errors are not, since the request may already have been processed.
+        This relies on the module-level session of typesense < 2.0 (pinned in
+        requirements.txt); without it the client keeps its default pool.
+        """
+        api_call = getattr(typesense, "api_call", None)
+        session = getattr(api_call, "session", None)
+        if not isinstance(session, requests.Session):
+            logger.warning(
+                "typesense %s has no shared HTTP session; TYPESENSE_POOL_SIZE and "
+                "connect retries are not applied",
+                getattr(typesense, "__version__", "(unknown version)")
+            )
+            return
+
+        retry = Retry(
+            total=3,
+            connect=3,
+            read=0,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=Config.TYPESENSE_POOL_SIZE,
+            pool_maxsize=Config.TYPESENSE_POOL_SIZE,
+            max_retries=retry
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def _search_documents(self, search_params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a Typesense document search through the circuit breaker.
+
+        Only outages (connection errors, timeouts, 5xx) count as failures;
+        bad requests (4xx) are the caller's problem, not Typesense's.
+
+        Args:
+            search_params: Typesense search parameters
+
+        Returns:
+            Typesense search results
+
+        Raises:
+            CircuitOpenError: If Typesense has been failing and the circuit is open
+        """
+        self.typesense_breaker.before_call()
+
+        try:
+            results = self.documents.search(search_params)
+        except TYPESENSE_OUTAGE_ERRORS:
+            self.typesense_breaker.record_failure()
+            raise
+        except Exception:
+            # Typesense answered (e.g. 4xx); also resolves a half-open probe
+            self.typesense_breaker.record_success()
+            raise
+
+        self.typesense_breaker.record_success()
+        return results
 
     def search(
         self,
@@ -107,7 +329,7 @@ class RAGNaturalLanguageSearch:
         start_time = time.time()
 
         # Check if query contains explicit limit (e.g., "5 most expensive", "top 10")
-        extracted_limit = self._extract_limit_from_query(query)
+        extracted_limit = extract_limit_from_query(query)
         if extracted_limit:
             max_results = extracted_limit
 
@@ -237,34 +459,27 @@ class RAGNaturalLanguageSearch:
             typesense_query=typesense_query
         )
 
-    def _extract_limit_from_query(self, query: str) -> Optional[int]:
-        """
-        Extract result limit from query if explicitly mentioned.
-
-        Examples:
-        - "5 most expensive" → 5
-        - "top 10 reagents" → 10
-        - "first 3 gloves" → 3
+    def embed_query(self, query: str) -> List[float]:
         """
-        import re
+        Embed a query with the same OpenAI model used for the product embeddings.
 
-        patterns = [
-            r'^(\d+)\s+(?:most|least|top|best|worst|cheapest|expensive)',
-            r'top\s+(\d+)',
-            r'first\s+(\d+)',
-            r'^(\d+)\s+\w+',
-        ]
-
-        query_lower = query.lower().strip()
+        Args:
+            query: Search query
 
-        for pattern in patterns:
-            match = re.search(pattern, query_lower)
-            if match:
-                limit = int(match.group(1))
-                if 1 <= limit <= 100:
-                    return limit
+        Returns:
+            Embedding vector
+        """
+        embedding = self.embedding_cache.get(query)
+        if embedding is not None:
+            return embedding
 
-        return None
+        response = self.openai_client.embeddings.create(
+            model=Config.OPENAI_EMBEDDING_MODEL,
+            input=query
+        )
+        embedding = response.data[0].embedding
+        self.embedding_cache.set(query, embedding)
+        return embedding
 
     def _retrieve_semantic_results(
         self,
@@ -286,14 +501,16 @@ class RAGNaturalLanguageSearch:
         Returns:
             Typesense search results with parsed_nl_query
         """
+        # Debug runs always hit Typesense so the NL parsing output is printed
+        if not debug:
+            cached, _ = self.retrieval_cache.get(query, retrieval_count)
+            if cached is not None:
+                return cached
+
         search_params = {
+            **NL_SEARCH_PARAMS,
             "q": query,
-            "query_by": "name,sku,name_normalized,sku_normalized,description,short_description,categories",
-            "query_by_weights": "100,100,4,4,3,3,1",  # Extreme priority to original fields, normalized only assist when original fails
-            "nl_query": "true",  # LLM Call 1: Extract filters, sorts, etc.
-            "nl_model_id": self.nl_model_id,
             "per_page": retrieval_count,
-            "sort_by": "brand_priority:desc,_text_match:desc,price:asc",  # In-house brands first
         }
 
         # Enable debug to see NL query parsing
@@ -301,9 +518,7 @@ class RAGNaturalLanguageSearch:
             search_params["nl_query_debug"] = "true"
 
         try:
-            results = self.typesense_client.collections[self.collection_name].documents.search(
-                search_params
-            )
+            results = self._search_documents(search_params)
 
             if debug:
                 print(f"\n=== RAG Step 1: NL Search + Retrieval ===")
@@ -315,12 +530,15 @@ class RAGNaturalLanguageSearch:
                     print(f"Extracted filters: {parsed.get('filter_by', 'none')}")
                     print(f"Extracted sort: {parsed.get('sort_by', 'default')}")
                     print(f"\nFull parsed_nl_query response:")
-                    import json
                     print(json.dumps(results["parsed_nl_query"], indent=2))
                 else:
                     print(f"WARNING: No parsed_nl_query in response!")
                     print(f"Available keys: {list(results.keys())}")
 
+            # Only cache successful NL parses (an LLM failure may be transient)
+            if "parsed_nl_query" in results:
+                self.retrieval_cache.set(query, results, retrieval_count)
+
             return results
 
         except Exception as e:
@@ -328,15 +546,8 @@ class RAGNaturalLanguageSearch:
 
             # Fallback to simple text search if NL fails
             try:
-                fallback_params = {
-                    "q": query,
-                    "query_by": "name,sku,name_normalized,sku_normalized,description,short_description,categories",
-                    "query_by_weights": "100,100,4,4,3,3,1",
-                    "per_page": retrieval_count,
-                }
-                results = self.typesense_client.collections[self.collection_name].documents.search(
-                    fallback_params
-                )
+                fallback_params = {**TEXT_SEARCH_PARAMS, "q": query, "per_page": retrieval_count}
+                results = self._search_documents(fallback_params)
                 print("  Fallback: Using text-only search (NL search failed)")
                 return results
             except Exception as e2:
@@ -378,17 +589,18 @@ class RAGNaturalLanguageSearch:
                 for category in product.categories:
                     category_products[category].append(product)
 
-        # Sort categories by number of products (most products first)
-        sorted_categories = sorted(
+        # Top N categories by number of products (most products first; ties keep
+        # retrieval order, same as a stable sort)
+        top_categories = heapq.nlargest(
+            max_categories,
             category_products.items(),
-            key=lambda x: len(x[1]),
-            reverse=True
+            key=lambda x: len(x[1])
         )
 
         # Build context: top N categories with sample products
         context = {}
 
-        for category, category_prods in sorted_categories[:max_categories]:
+        for category, category_prods in top_categories:
             # Sample first N products from this category
             samples = []
             for prod in category_prods[:samples_per_category]:
@@ -420,6 +632,27 @@ class RAGNaturalLanguageSearch:
         """
         start_time = time.time()
 
+        # Classification only depends on the query and the retrieved categories
+        cache_key = (
+            normalize_query(query),
+            tuple(category_context),
+            Config.OPENAI_MODEL,
+            CLASSIFICATION_PROMPT_VERSION
+        )
+        cached = self.classification_cache.get(cache_key)
+        if cached is not None:
+            if debug:
+                print(f"\n=== RAG Step 3: LLM Classification (cached) ===")
+                print(f"Category: {cached.category}")
+                print(f"Confidence: {cached.confidence:.2f}")
+            return RAGCategoryClassification(
+                category=cached.category,
+                confidence=cached.confidence,
+                reasoning=cached.reasoning,
+                top_categories=cached.top_categories,
+                llm_response_time_ms=(time.time() - start_time) * 1000
+            )
+
         # Build prompt for LLM
         prompt = self._build_classification_prompt(query, category_context)
 
@@ -430,7 +663,7 @@ class RAGNaturalLanguageSearch:
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a product categorization expert. Analyze search queries and product context to determine the most relevant category."
+                        "content": CLASSIFICATION_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -444,7 +677,7 @@ class RAGNaturalLanguageSearch:
             llm_response_time_ms = (time.time() - start_time) * 1000
 
             # Parse LLM response
-            result = json.loads(response.choices[0].message.content)
+            result = orjson.loads(response.choices[0].message.content)
 
             category = result.get("category")
             confidence = float(result.get("confidence", 0.0))
@@ -463,13 +696,16 @@ class RAGNaturalLanguageSearch:
                 print(f"Confidence: {confidence:.2f}")
                 print(f"Reasoning: {reasoning}")
 
-            return RAGCategoryClassification(
+            classification = RAGCategoryClassification(
                 category=category,
                 confidence=confidence,
                 reasoning=reasoning,
                 top_categories=top_categories,
                 llm_response_time_ms=llm_response_time_ms
             )
+            self.classification_cache.set(cache_key, classification)
+
+            return classification
 
         except Exception as e:
             print(f"Error in LLM classification: {e}")
@@ -498,70 +734,9 @@ class RAGNaturalLanguageSearch:
         Returns:
             LLM prompt string
         """
-        context_str = json.dumps(category_context, indent=2)
-
-        prompt = f"""Given the user search query and the top product categories with sample products, determine the most relevant category.
-
-**User Query**: "{query}"
-
-**Top Categories with Sample Products**:
-{context_str}
-
-**Task**:
-1. Analyze the query intent
-2. Consider the sample products in each category
-3. Determine which category best matches the query
-4. Assign a confidence score (0.0 to 1.0)
-
-**Decision Criteria**:
-- **Exact match** (SKU or exact product name): Very high confidence (0.9-1.0)
-- **Clear product type** (e.g., "nitrile gloves" → Gloves): High confidence (0.7-0.9)
-- **Product type + attributes** (e.g., "blue nitrile gloves"): High confidence (0.7-0.9)
-- **Brand + product type** (e.g., "Thermo Fisher pipettes"): Medium-high confidence (0.6-0.8)
-- **Ambiguous or attribute-only**: Low confidence (0.0-0.5) → Return null
-
-**CRITICAL RULES - Return null for category and confidence < 0.5 if**:
-1. **Single attribute word without product type**:
-   - Examples: "clear", "large", "medium", "blue", "sterile", "disposable"
-   - These are attributes (color, size, property), NOT product types
-   - Rule: If query is 1-2 words AND doesn't mention a specific product type, return null
-
-2. **Brand name only without product type**:
-   - Examples: "Mercedes Scientific", "Ansell", "Yamato", "Thermo Fisher"
-   - Brands span many categories, too ambiguous to filter
-   - Rule: If query is only a brand name, return null
-
-3. **Generic attribute categories**:
-   - Avoid categories like "Brand: X", "Size: X", "Color: X"
-   - These are not product categories, they're attributes
-   - Rule: If category name starts with "Brand:", "Size:", "Color:", return null
-
-4. **Highly ambiguous product types**:
-   - Examples: "filters" (could be water, air, syringe, etc.)
-   - Multiple distinct product categories match equally well
-   - Rule: If 3+ categories match equally, return null
-
-**Important**:
-- Be CONSERVATIVE - when in doubt, return null with low confidence
-- Only return a category if you're confident (>= 0.7) it's the right one
-- A null response is better than a wrong category filter
-- If you see an exact SKU or product name match, prioritize that category
-
-**Response Format** (JSON):
-{{
-  "category": "CategoryName" or null,
-  "confidence": 0.85,
-  "reasoning": "Explanation of why this category was chosen (or why null was returned)"
-}}
-
-**Examples**:
-
-Query: "clear" → {{"category": null, "confidence": 0.2, "reasoning": "Single attribute word without product type"}}
-Query: "Mercedes Scientific" → {{"category": null, "confidence": 0.3, "reasoning": "Brand only, spans many categories"}}
-Query: "nitrile gloves" → {{"category": "Products/Gloves & Apparel/Gloves", "confidence": 0.85, "reasoning": "Clear product type match"}}
-Query: "Ansell gloves ANS 5789911" → {{"category": "Products/Gloves & Apparel/Gloves", "confidence": 0.95, "reasoning": "Exact SKU match"}}
-"""
-        return prompt
+        # (non-ASCII product names are kept as-is rather than \u-escaped)
+        context_str = orjson.dumps(category_context, option=orjson.OPT_INDENT_2).decode()
+        return CLASSIFICATION_PROMPT_TEMPLATE.substitute(query=query, context_str=context_str)
 
     def _search_with_category_filter(
         self,
@@ -613,24 +788,21 @@ Query: "Ansell gloves ANS 5789911" → {{"category": "Products/Gloves & Apparel/
             sort_by = f"brand_priority:desc,{nl_sort}"
         else:
             # Default: brand priority first, then relevance, then price
-            sort_by = "brand_priority:desc,_text_match:desc,price:asc"
+            sort_by = DEFAULT_SORT_BY
 
         # Use NL-extracted query text if available, otherwise original query
         query_text = parsed_params.get("q", query)
 
         search_params = {
+            **TEXT_SEARCH_PARAMS,
             "q": query_text,
-            "query_by": "name,sku,name_normalized,sku_normalized,description,short_description,categories",
-            "query_by_weights": "100,100,4,4,3,3,1",  # Extreme priority to original fields, normalized only assist when original fails
             "filter_by": combined_filter,
             "per_page": max_results,
             "sort_by": sort_by,
         }
 
         try:
-            results = self.typesense_client.collections[self.collection_name].documents.search(
-                search_params
-            )
+            results = self._search_documents(search_params)
 
             if debug:
                 print(f"\n=== RAG Step 4: Filtered Search ===")
@@ -677,39 +849,25 @@ Query: "Ansell gloves ANS 5789911" → {{"category": "Products/Gloves & Apparel/
         Returns:
             List of Product models
         """
-        products = []
-
-        for hit in hits:
-            doc = hit.get("document", {})
-
-            try:
-                product = Product(
-                    product_id=doc.get("product_id"),
-                    sku=doc.get("sku", ""),
-                    name=doc.get("name", ""),
-                    url_key=doc.get("url_key", ""),
-                    stock_status=doc.get("stock_status", "OUT_OF_STOCK"),
-                    product_type=doc.get("product_type", "simple"),
-                    description=doc.get("description"),
-                    short_description=doc.get("short_description"),
-                    price=doc.get("price"),
-                    currency=doc.get("currency", "USD"),
-                    image_url=doc.get("image_url"),
-                    categories=doc.get("categories", []),
-                )
-                products.append(product)
-
-            except Exception as e:
-                print(f"Error transforming product: {e}")
-                continue
+        # Typesense document keys match the Product fields, so validate the
+        # whole batch in one pydantic-core pass (extra fields are ignored)
+        docs = [hit["document"] for hit in hits if "document" in hit]
 
-        return products
+        try:
+            return PRODUCT_LIST_ADAPTER.validate_python(docs)
+        except ValidationError:
+            # Keep the valid products, skip the malformed ones
+            products = []
+            for doc in docs:
+                try:
+                    products.append(Product.model_validate(doc))
+                except ValidationError as e:
+                    print(f"Error transforming product: {e}")
+            return products
 
 
 if __name__ == "__main__":
     # Test the RAG search
-    import json
-
     search_engine = RAGNaturalLanguageSearch()
 
     test_queries = [
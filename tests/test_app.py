@@ -0,0 +1,205 @@
+"""Tests for the Flask API request handling (no Typesense/OpenAI needed)."""
+import pytest
+
+from src import app as app_module
+from src.cache import SemanticCache
+from src.models import Product, SearchResponse
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Test client whose searches are recorded instead of executed."""
+    calls = []
+
+    def fake_cached_search(query, max_results, debug, confidence_threshold):
+        calls.append((query, max_results, debug, confidence_threshold))
+        # Timing and cache tier differ per call, as they do across workers
+        response = SearchResponse(
+            results=[],
+            total=0,
+            query_time_ms=float(len(calls)),
+            typesense_query={"original_query": query, "cache": "exact" if len(calls) % 2 else "miss"}
+        )
+        return response, None if debug else app_module._search_etag(response)
+
+    monkeypatch.setattr(app_module, "_cached_search", fake_cached_search)
+    test_client = app_module.app.test_client()
+    test_client.calls = calls
+    return test_client
+
+
+def test_post_search_defaults(client):
+    response = client.post("/api/search", json={"query": "gloves"})
+
+    assert response.status_code == 200
+    assert client.calls == [("gloves", 20, False, 0.75)]
+
+
+def test_post_search_accepts_valid_options(client):
+    response = client.post("/api/search", json={
+        "query": "gloves",
+        "max_results": 5,
+        "debug": True,
+        "confidence_threshold": 0.5,
+    })
+
+    assert response.status_code == 200
+    assert client.calls == [("gloves", 5, True, 0.5)]
+
+
+@pytest.mark.parametrize("body", [
+    {"query": "gloves", "debug": "false"},
+    {"query": "gloves", "debug": 1},
+    {"query": "gloves", "confidence_threshold": [0.5]},
+    {"query": "gloves", "confidence_threshold": {"value": 0.5}},
+    {"query": "gloves", "confidence_threshold": True},
+    {"query": "gloves", "confidence_threshold": 1.5},
+    {"query": "gloves", "confidence_threshold": -0.1},
+    {"query": "gloves", "max_results": 0},
+    {"query": "  "},
+])
+def test_post_search_rejects_invalid_options(client, body):
+    response = client.post("/api/search", json=body)
+
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+    assert client.calls == []
+
+
+def test_get_search_parses_query_params(client):
+    response = client.get("/api/search?q=gloves&limit=10&debug=true&confidence_threshold=0.9")
+
+    assert response.status_code == 200
+    assert client.calls == [("gloves", 10, True, 0.9)]
+
+
+@pytest.mark.parametrize("params", [
+    "q=gloves&confidence_threshold=high",
+    "q=gloves&confidence_threshold=nan",
+    "q=gloves&confidence_threshold=2",
+])
+def test_get_search_rejects_invalid_threshold(client, params):
+    response = client.get(f"/api/search?{params}")
+
+    assert response.status_code == 400
+    assert client.calls == []
+
+
+def test_get_search_etag_ignores_timing_and_cache_tier(client):
+    first = client.get("/api/search?q=gloves")
+    second = client.get("/api/search?q=gloves")
+
+    assert first.headers["ETag"]
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert "max-age" in first.headers["Cache-Control"]
+
+
+@pytest.mark.parametrize("if_none_match", [
+    "{etag}",
+    "W/{etag}",
+    "{etag_gzip}",
+    '"other", {etag}',
+    "*",
+])
+def test_get_search_returns_304_when_etag_matches(client, if_none_match):
+    etag = client.get("/api/search?q=gloves").headers["ETag"]
+    header = if_none_match.format(etag=etag, etag_gzip=etag[:-1] + ':gzip"')
+
+    response = client.get("/api/search?q=gloves", headers={"If-None-Match": header})
+
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_get_search_returns_body_when_etag_differs(client):
+    response = client.get("/api/search?q=gloves", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.get_json()["total"] == 0
+
+
+def test_get_search_debug_is_not_http_cached(client):
+    response = client.get("/api/search?q=gloves&debug=true")
+
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+
+
+class FakeSearchEngine:
+    """Search engine returning one product, with debug-only metadata."""
+
+    def __init__(self):
+        self.searches = 0
+
+    def search(self, query, max_results, debug, confidence_threshold):
+        self.searches += 1
+        return SearchResponse(
+            results=[Product(
+                product_id="1",
+                sku="A1",
+                name="Nitrile gloves",
+                url_key="gloves",
+                stock_status="IN_STOCK"
+            )],
+            total=1,
+            query_time_ms=250.0,
+            typesense_query={"original_query": query, "rag_reasoning": f"run {self.searches}"}
+        )
+
+    def embed_query(self, query):
+        return [1.0, 0.0] if "gloves" in query else [0.0, 1.0]
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    fake = FakeSearchEngine()
+    cache = SemanticCache(embed_fn=fake.embed_query)
+    monkeypatch.setattr(app_module, "get_search_engine", lambda: fake)
+    monkeypatch.setattr(app_module, "get_search_cache", lambda: cache)
+    return fake
+
+
+def test_cache_hits_reuse_the_etag_without_serializing(engine, monkeypatch):
+    dumps = []
+    search_etag = app_module._search_etag
+    monkeypatch.setattr(app_module, "_search_etag", lambda response: dumps.append(1) or search_etag(response))
+
+    fresh, fresh_etag = app_module._cached_search("nitrile gloves", 20, False, 0.75)
+    exact, exact_etag = app_module._cached_search("Nitrile Gloves", 20, False, 0.75)
+    semantic, semantic_etag = app_module._cached_search("gloves of nitrile", 20, False, 0.75)
+
+    assert engine.searches == 1
+    assert len(dumps) == 1
+    assert fresh_etag == exact_etag == semantic_etag
+    assert semantic.typesense_query == {"original_query": "gloves of nitrile", "cache": "semantic"}
+    assert "rag_reasoning" not in fresh.typesense_query
+
+
+def test_get_revalidation_is_served_from_the_cache(engine):
+    client = app_module.app.test_client()
+    first = client.get("/api/search?q=nitrile%20gloves")
+
+    response = client.get("/api/search?q=nitrile%20gloves", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.get_json()["total"] == 1
+    assert response.status_code == 304
+    assert engine.searches == 1
+
+
+def test_fresh_searches_get_the_same_etag_across_workers(engine, monkeypatch):
+    # Two workers with their own caches; the LLM reasoning differs between runs
+    _, first_etag = app_module._cached_search("nitrile gloves", 20, False, 0.75)
+    monkeypatch.setattr(app_module, "get_search_cache", lambda: SemanticCache(embed_fn=engine.embed_query))
+    _, second_etag = app_module._cached_search("nitrile gloves", 20, False, 0.75)
+
+    assert engine.searches == 2
+    assert first_etag == second_etag
+
+
+def test_debug_search_skips_cache_and_etag(engine):
+    response, etag = app_module._cached_search("nitrile gloves", 20, True, 0.75)
+
+    assert etag is None
+    assert response.typesense_query["rag_reasoning"] == "run 1"
+    assert app_module._cached_search("nitrile gloves", 20, True, 0.75)[0].typesense_query["rag_reasoning"] == "run 2"
@@ -0,0 +1,169 @@
+"""Tests for the in-process search caches (stub embeddings, no OpenAI calls)."""
+import logging
+
+import pytest
+
+from src import cache as cache_module
+from src.cache import LRUCache, SemanticCache, normalize_query
+
+# Stub embeddings: queries mapped to the same vector are "paraphrases"
+EMBEDDINGS = {
+    "nitrile gloves": [1.0, 0.0, 0.0],
+    "gloves made of nitrile": [0.99, 0.1, 0.0],
+    "pipette tips": [0.0, 1.0, 0.0],
+    "10 ml tubes": [0.0, 0.0, 1.0],
+    "100 ml tubes": [0.0, 0.0, 1.0],
+    "10 ml test tubes": [0.0, 0.05, 1.0],
+}
+
+
+class FakeClock:
+    """Replacement for time.time() in src.cache."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def embed_calls():
+    return []
+
+
+@pytest.fixture
+def make_cache(embed_calls):
+    def embed(query):
+        embed_calls.append(query)
+        return EMBEDDINGS[query.lower().strip()]
+
+    def factory(**kwargs):
+        kwargs.setdefault("similarity_threshold", 0.95)
+        return SemanticCache(embed_fn=embed, **kwargs)
+
+    return factory
+
+
+def test_normalize_query():
+    assert normalize_query("  Nitrile   GLOVES ") == "nitrile gloves"
+
+
+def test_exact_hit_ignores_case_and_whitespace(make_cache, embed_calls):
+    cache = make_cache()
+    cache.set("nitrile gloves", "response")
+    embed_calls.clear()
+
+    assert cache.get("  Nitrile  Gloves") == ("response", "exact")
+    assert embed_calls == []  # exact tier needs no embedding
+
+
+def test_semantic_hit_on_paraphrase(make_cache):
+    cache = make_cache()
+    cache.set("nitrile gloves", "response")
+
+    assert cache.get("gloves made of nitrile") == ("response", "semantic")
+
+
+def test_semantic_miss_below_threshold(make_cache):
+    cache = make_cache()
+    cache.set("nitrile gloves", "response")
+
+    assert cache.get("pipette tips") == (None, None)
+
+
+def test_numbers_must_match_for_semantic_hit(make_cache):
+    cache = make_cache()
+    cache.set("10 ml tubes", "ten")
+
+    # Same embedding, different quantity
+    assert cache.get("100 ml tubes") == (None, None)
+    # Similar embedding, same quantity
+    assert cache.get("10 ml test tubes") == ("ten", "semantic")
+
+
+def test_namespaces_are_isolated(make_cache):
+    cache = make_cache()
+    cache.set("nitrile gloves", "twenty", namespace=(20, 0.75))
+    cache.set("nitrile gloves", "five", namespace=(5, 0.75))
+
+    assert cache.get("nitrile gloves", (20, 0.75)) == ("twenty", "exact")
+    assert cache.get("nitrile gloves", (5, 0.75)) == ("five", "exact")
+    assert cache.get("gloves made of nitrile", (5, 0.75)) == ("five", "semantic")
+    assert cache.get("nitrile gloves", (20, 0.5)) == (None, None)
+
+
+def test_entries_expire_after_ttl(make_cache, clock):
+    cache = make_cache(ttl_seconds=60)
+    cache.set("nitrile gloves", "response")
+
+    clock.now += 59
+    assert cache.get("nitrile gloves") == ("response", "exact")
+
+    clock.now += 1
+    assert cache.get("nitrile gloves") == (None, None)
+    assert cache.get("gloves made of nitrile") == (None, None)
+
+
+def test_ring_buffer_evicts_oldest_entry(make_cache):
+    cache = make_cache(max_entries=2)
+    cache.set("nitrile gloves", "gloves")
+    cache.set("pipette tips", "tips")
+    cache.set("10 ml tubes", "tubes")
+
+    assert cache.get("nitrile gloves") == (None, None)
+    assert cache.get("gloves made of nitrile") == (None, None)
+    assert cache.get("pipette tips") == ("tips", "exact")
+    assert cache.get("10 ml tubes") == ("tubes", "exact")
+
+
+def test_overwriting_a_query_reuses_its_slot(make_cache):
+    cache = make_cache(max_entries=2)
+    cache.set("nitrile gloves", "old")
+    cache.set("pipette tips", "tips")
+    cache.set("Nitrile Gloves", "new")
+
+    assert cache.get("nitrile gloves") == ("new", "exact")
+    assert cache.get("pipette tips") == ("tips", "exact")
+
+
+def test_embedding_failure_is_a_logged_miss(caplog):
+    def failing_embed(query):
+        raise RuntimeError("OpenAI down")
+
+    cache = SemanticCache(embed_fn=failing_embed)
+
+    with caplog.at_level(logging.WARNING, logger="src.cache"):
+        cache.set("nitrile gloves", "response")
+        assert cache.get("nitrile gloves") == (None, None)
+
+    assert "OpenAI down" in caplog.text
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_cache_entries_expire(clock):
+    cache = LRUCache(ttl_seconds=10)
+    cache.set("a", 1)
+
+    clock.now += 10
+
+    assert cache.get("a") is None
@@ -0,0 +1,131 @@
+"""Tests for the circuit breaker state transitions."""
+import pytest
+
+from src import circuit_breaker as breaker_module
+from src.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    """Replacement for time.time() in src.circuit_breaker."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(breaker_module.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("Typesense", window=4, failure_ratio=0.5, cooldown_seconds=5, min_calls=4)
+
+
+def fail_calls(breaker, count):
+    for _ in range(count):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_stays_closed_below_min_calls(breaker):
+    fail_calls(breaker, 3)
+
+    assert breaker.state == "closed"
+    breaker.before_call()
+
+
+def test_stays_closed_at_failure_ratio(breaker):
+    for failed in (True, False, True, False):
+        breaker.before_call()
+        breaker.record_failure() if failed else breaker.record_success()
+
+    assert breaker.state == "closed"
+
+
+def test_opens_above_failure_ratio(breaker):
+    fail_calls(breaker, 4)
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_rejects_until_cooldown_ends(breaker, clock):
+    fail_calls(breaker, 4)
+
+    clock.now += 4.9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now += 0.1
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+def test_half_open_lets_a_single_probe_through(breaker, clock):
+    fail_calls(breaker, 4)
+    clock.now += 5
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_probe_success_closes_circuit(breaker, clock):
+    fail_calls(breaker, 4)
+    clock.now += 5
+
+    breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+    breaker.before_call()
+    # The failure window starts over after recovery
+    fail_calls(breaker, 3)
+    assert breaker.state == "closed"
+
+
+def test_probe_failure_reopens_immediately(breaker, clock):
+    fail_calls(breaker, 4)
+    clock.now += 5
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now += 5
+    breaker.before_call()
+    assert breaker.state == "half_open"
+
+
+def test_lost_probe_is_replaced_after_cooldown(breaker, clock):
+    fail_calls(breaker, 4)
+    clock.now += 5
+    breaker.before_call()  # probe never reports back
+
+    clock.now += 5
+    breaker.before_call()
+    breaker.record_success()
+
+    assert breaker.state == "closed"
+
+
+def test_late_results_while_open_are_ignored(breaker, clock):
+    fail_calls(breaker, 4)
+
+    breaker.record_failure()
+    breaker.record_success()
+
+    assert breaker.state == "open"
+    clock.now += 5
+    breaker.before_call()
+    assert breaker.state == "half_open"
@@ -0,0 +1,106 @@
+"""Tests for the GraphQL product fetching in the indexer (no network needed)."""
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+
+# The indexer runs from src/ and imports its siblings directly
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import Config  # noqa: E402
+
+# The indexer validates config on import; no request reaches OpenAI/Typesense here
+Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or "test-key"
+Config.TYPESENSE_API_KEY = Config.TYPESENSE_API_KEY or "test-key"
+
+import indexer as indexer_module  # noqa: E402
+from indexer import MercedesProductIndexer  # noqa: E402
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.content = orjson.dumps({"data": data})
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeGraphQLSession:
+    """Answers each aliased term with one single-page product, recording requests."""
+
+    def __init__(self, fail_batches=False, failing_terms=()):
+        self.fail_batches = fail_batches
+        self.failing_terms = set(failing_terms)
+        self.requests = []
+
+    def post(self, url, data, headers, timeout):
+        variables = orjson.loads(data)["variables"]
+        terms = [variables[f"search{i}"] for i in range(len(variables) // 2)]
+        self.requests.append(terms)
+
+        if (self.fail_batches and len(terms) > 1) or self.failing_terms & set(terms):
+            raise ConnectionError("GraphQL unavailable")
+
+        return FakeResponse({
+            f"t{i}": {
+                "items": [{"sku": f"sku-{term}", "name": term}],
+                "page_info": {"current_page": 1, "total_pages": 1},
+            }
+            for i, term in enumerate(terms)
+        })
+
+
+@pytest.fixture
+def indexer():
+    return MercedesProductIndexer()
+
+
+def test_fetch_batches_terms_into_one_request(indexer):
+    indexer.graphql_session = FakeGraphQLSession()
+
+    products = indexer._fetch_products_for_terms(["gloves", "tips"])
+
+    assert indexer.graphql_session.requests == [["gloves", "tips"]]
+    assert [[item["sku"] for item in items] for items in products] == [["sku-gloves"], ["sku-tips"]]
+
+
+def test_failed_batch_falls_back_to_single_terms(indexer, capsys):
+    indexer.graphql_session = FakeGraphQLSession(fail_batches=True)
+
+    products = indexer._fetch_products_for_terms(["gloves", "tips", "tubes"])
+
+    assert indexer.graphql_session.requests[1:] == [["gloves"], ["tips"], ["tubes"]]
+    assert [len(items) for items in products] == [1, 1, 1]
+    assert "'gloves', 'tips', 'tubes'" in capsys.readouterr().out
+
+
+def test_failing_term_only_loses_itself(indexer, capsys):
+    indexer.graphql_session = FakeGraphQLSession(failing_terms={"tips"})
+
+    products = indexer._fetch_products_for_terms(["gloves", "tips", "tubes"])
+
+    assert [len(items) for items in products] == [1, 0, 1]
+    assert "Skipping search term 'tips'" in capsys.readouterr().out
+
+
+def test_early_stop_skips_unsubmitted_batches(indexer, monkeypatch):
+    submitted = []
+
+    class RecordingExecutor(indexer_module.ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args[0])
+            return super().submit(fn, *args, **kwargs)
+
+    terms = tuple(f"term{i}" for i in range(20))
+    monkeypatch.setattr(indexer_module, "ThreadPoolExecutor", RecordingExecutor)
+    monkeypatch.setattr(indexer_module, "TERMS_PER_REQUEST", 1)
+    monkeypatch.setattr(indexer, "_get_search_terms", lambda: terms)
+    monkeypatch.setattr(indexer, "_transform_product", lambda item: item)
+    indexer.graphql_session = FakeGraphQLSession()
+
+    products = indexer.fetch_products(max_products=1, max_workers=2)
+
+    assert [product["sku"] for product in products] == ["sku-term0"]
+    # The in-flight window plus one refill per merged batch, not all 20 batches
+    assert len(submitted) <= 4
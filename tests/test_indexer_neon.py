@@ -0,0 +1,97 @@
+"""Tests for incremental re-indexing in the Neon indexer (no database needed)."""
+import sys
+from pathlib import Path
+
+import orjson
+import pytest
+
+# The indexer runs from src/ and imports its siblings directly
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import Config  # noqa: E402
+
+# The indexer validates config on import; no request reaches OpenAI/Typesense here
+Config.OPENAI_API_KEY = Config.OPENAI_API_KEY or "test-key"
+Config.TYPESENSE_API_KEY = Config.TYPESENSE_API_KEY or "test-key"
+
+from indexer_neon import NeonProductIndexer  # noqa: E402
+
+
+class FakeExportResponse:
+    def __init__(self, docs):
+        self.lines = [orjson.dumps(doc) for doc in docs]
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def get(self, url, **kwargs):
+        return FakeExportResponse(self.docs)
+
+
+@pytest.fixture
+def indexer(monkeypatch):
+    monkeypatch.setenv("NEON_DATABASE_URL", "postgresql://test")
+    return NeonProductIndexer()
+
+
+def test_content_hash_ignores_key_order(indexer):
+    first = {"id": "A1", "name": "Gloves", "price": 9.5}
+    second = {"price": 9.5, "name": "Gloves", "id": "A1"}
+
+    assert indexer._content_hash(first) == indexer._content_hash(second)
+
+
+def test_content_hash_ignores_none_fields(indexer):
+    document = {"id": "A1", "name": "Gloves", "price": 9.5}
+
+    assert indexer._content_hash({**document, "color": None}) == indexer._content_hash(document)
+
+
+def test_content_hash_changes_with_content(indexer):
+    document = {"id": "A1", "name": "Gloves", "price": 9.5}
+
+    assert indexer._content_hash({**document, "price": 10.0}) != indexer._content_hash(document)
+
+
+def test_load_content_hashes(indexer):
+    indexer.session = FakeSession([
+        {"id": "A1", "content_hash": "h1"},
+        {"id": "B2", "content_hash": "h2"},
+    ])
+
+    assert indexer._load_content_hashes() == {"A1": "h1", "B2": "h2"}
+
+
+def test_legacy_collection_is_refused(indexer):
+    indexer.session = FakeSession([
+        {"id": "A1", "content_hash": "h1"},
+        {"id": "8f3c"},
+    ])
+
+    # Emplacing by SKU next to the old random-ID documents would duplicate every product
+    with pytest.raises(ValueError, match="recreate"):
+        indexer._load_content_hashes()
+
+
+def test_run_imports_nothing_into_a_legacy_collection(indexer, monkeypatch):
+    imported = []
+    indexer.session = FakeSession([{"id": "8f3c"}])
+    monkeypatch.setattr(indexer, "create_collection", lambda: False)  # User kept the collection
+    monkeypatch.setattr(indexer, "_check_nl_model", lambda: True)
+    monkeypatch.setattr(indexer, "index_products", lambda *args, **kwargs: imported.append(args))
+
+    with pytest.raises(ValueError):
+        indexer.run()
+
+    assert imported == []
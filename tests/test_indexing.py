@@ -0,0 +1,25 @@
+"""Tests for the helpers shared by both indexers."""
+import sys
+from pathlib import Path
+
+# The indexers run from src/ and import their siblings directly
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from indexing import clean_and_deduplicate_categories  # noqa: E402
+
+
+def test_categories_drop_root_prefix_and_prefer_shortest_path():
+    categories = clean_and_deduplicate_categories([
+        "Mercedes Scientific Main Store/Shop By Lab/Chemistry/Gloves/Nitrile",
+        "Mercedes Scientific Main Store/Products/Gloves/Nitrile",
+        "Mercedes Scientific Main Store/Products/Pipettes",
+        None,
+        "",
+    ])
+
+    assert categories == ["Products/Pipettes", "Products/Gloves/Nitrile"]
+
+
+def test_categories_empty():
+    assert clean_and_deduplicate_categories([]) == []
+    assert clean_and_deduplicate_categories(None) == []
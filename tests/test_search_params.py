@@ -0,0 +1,16 @@
+"""Tests for the query settings shared by both search engines."""
+import pytest
+
+from src.search_params import extract_limit_from_query
+
+
+@pytest.mark.parametrize("query, limit", [
+    ("5 most expensive gloves", 5),
+    ("Top 10 reagents", 10),
+    ("first 3 pipettes", 3),
+    ("12 beakers", 12),
+    ("nitrile gloves", None),
+    ("500 ml beaker", None),  # Above the 100-result sanity limit
+])
+def test_extract_limit_from_query(query, limit):
+    assert extract_limit_from_query(query) == limit